@@ -0,0 +1,171 @@
+"""Бенчмарк опроса серверов и RCON на локальных заглушках.
+
+Запуск: python -m Benchmarks.bench_minecraft [--servers 10 100 1000] [--latency 0.02]
+
+Для каждого числа серверов измеряется проход опроса (как в цикле
+update_embed: кэш статусов, опросчик, резолвер, статистика, трекер игроков),
+скорость RCON-команд через RCONPool и задержка event loop во время замеров.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.fake_servers import FakeBedrockServer, FakeJavaServer, FakeRCONServer, start_all, stop_all
+from Modules.Minecraft.cache import StatusCache
+from Modules.Minecraft.players import PlayerTracker
+from Modules.Minecraft.poller import StatusPoller
+from Modules.Minecraft.resolver import AddressResolver
+from Modules.Minecraft.stats import StatsStore
+from Modules.Tools.rcon import RCONError, RCONPool
+
+
+class LoopLagMonitor:
+    """Замер задержки event loop: насколько позже запланированного просыпается задача"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    def __enter__(self):
+        self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "lag n/a"
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return f"lag avg {statistics.mean(ordered) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, max {ordered[-1] * 1000:.1f} ms"
+
+
+async def bench_sweep(count: int, args) -> None:
+    bedrock = int(count * args.bedrock_share)
+    servers = [
+        FakeJavaServer(latency=args.latency, jitter=jitter(args), drop_rate=args.drop_rate,
+                       players=12, sample_size=12)
+        for _ in range(count - bedrock)
+    ] + [
+        FakeBedrockServer(latency=args.latency, jitter=jitter(args), drop_rate=args.drop_rate)
+        for _ in range(bedrock)
+    ]
+    await start_all(servers)
+    targets = [("java" if isinstance(s, FakeJavaServer) else "bedrock", s.address) for s in servers]
+
+    with tempfile.TemporaryDirectory() as directory:
+        stats = StatsStore(os.path.join(directory, "stats.db"))
+        await stats.open()
+        poller = StatusPoller(args.concurrency, args.timeout, AddressResolver())
+        cache = StatusCache(poller, on_probe=stats.record)
+        players = PlayerTracker()
+
+        durations = []
+        with LoopLagMonitor() as lag:
+            for _ in range(args.sweeps):
+                start = time.perf_counter()
+                results = await cache.get_many(targets, max_age=0)
+                for channel_id, target in enumerate(targets):
+                    players.update(channel_id, results[target])
+                durations.append(time.perf_counter() - start)
+            flush_start = time.perf_counter()
+            await stats.flush()
+            flush = time.perf_counter() - flush_start
+        await stats.close()
+
+    online = sum(1 for result in results.values() if result["online"])
+    best = min(durations)
+    print(f"  sweep x{count}: best {best * 1000:.0f} ms, median {statistics.median(durations) * 1000:.0f} ms, "
+          f"{count / best:.0f} probes/s, online {online}/{count}, stats flush {flush * 1000:.0f} ms; {lag.summary()}")
+    await stop_all(servers)
+
+
+def jitter(args) -> float:
+    return args.latency if args.jitter is None else args.jitter
+
+
+async def bench_rcon(count: int, args) -> None:
+    servers = [
+        FakeRCONServer(latency=args.latency, jitter=jitter(args), drop_rate=args.drop_rate,
+                       response_size=args.rcon_size, vanilla=not args.rcon_pipelined)
+        for _ in range(min(count, args.rcon_servers))
+    ]
+    await start_all(servers)
+    pool = RCONPool(timeout=args.timeout)
+    mode = args.rcon_pipelined
+    commands = [f"say {i}" for i in range(count)]
+
+    with LoopLagMonitor() as lag:
+        # Одна команда за раз на один сервер
+        server = servers[0]
+        start = time.perf_counter()
+        for command in commands[:min(count, 200)]:
+            try:
+                await pool.execute("127.0.0.1", server.port, server.password, command, pipelined=mode)
+            except RCONError:
+                pass
+        sequential = min(count, 200) / (time.perf_counter() - start)
+
+        # Пачка команд по одному соединению
+        start = time.perf_counter()
+        results = await pool.execute_many("127.0.0.1", server.port, server.password, commands, pipelined=mode)
+        bulk = count / (time.perf_counter() - start)
+        errors = sum(1 for result in results if isinstance(result, Exception))
+
+        # Рассылка по всем серверам одновременно
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            pool.execute("127.0.0.1", s.port, s.password, commands[i % count], pipelined=mode)
+            for i, s in enumerate(servers)
+        ), return_exceptions=True)
+        broadcast = time.perf_counter() - start
+    await pool.close()
+
+    print(f"  rcon x{count}: sequential {sequential:.0f} cmd/s, execute_many {bulk:.0f} cmd/s "
+          f"({errors} errors), broadcast to {len(servers)} servers {broadcast * 1000:.0f} ms, "
+          f"rejected connections {sum(s.rejected for s in servers)}; {lag.summary()}")
+    await stop_all(servers)
+
+
+async def main(args) -> None:
+    for count in args.servers:
+        print(f"{count} servers:")
+        await bench_sweep(count, args)
+        await bench_rcon(count, args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарк опроса Minecraft-серверов и RCON")
+    parser.add_argument("--servers", type=int, nargs="+", default=[10, 100, 1000], help="числа отслеживаемых серверов")
+    parser.add_argument("--sweeps", type=int, default=3, help="проходов опроса на замер")
+    parser.add_argument("--latency", type=float, default=0.02, help="задержка ответа заглушек, с")
+    parser.add_argument("--jitter", type=float, default=None, help="разброс задержки, с (по умолчанию равен --latency)")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="доля запросов без ответа")
+    parser.add_argument("--bedrock-share", type=float, default=0.2, help="доля Bedrock-серверов")
+    parser.add_argument("--concurrency", type=int, default=64, help="одновременных опросов")
+    parser.add_argument("--timeout", type=float, default=2.0, help="таймаут опроса и RCON, с")
+    parser.add_argument("--rcon-size", type=int, default=64, help="размер ответа RCON, байт")
+    parser.add_argument("--rcon-servers", type=int, default=100, help="максимум RCON-серверов для рассылки")
+    parser.add_argument("--rcon-pipelined", action="store_true",
+                        help="конвейер команд RCON; заглушки тогда разбирают поток, а не по пакету за чтение")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
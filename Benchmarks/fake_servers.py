@@ -0,0 +1,251 @@
+"""Локальные заглушки Minecraft-серверов для бенчмарков.
+
+FakeJavaServer говорит на протоколе статуса Java (Server List Ping),
+FakeBedrockServer отвечает на RakNet Unconnected Ping, FakeRCONServer
+разбирает RCON-пакеты так же, как ванильный сервер. У каждой заглушки
+настраиваются задержка ответа, доля "потерянных" запросов и размер ответа.
+"""
+import asyncio
+import json
+import random
+import struct
+from typing import List, Optional, Tuple
+
+RAKNET_MAGIC = bytes.fromhex("00ffff00fefefefefdfdfdfd12345678")
+
+
+class FakeServerBase:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, drop_rate: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.requests = 0
+        self.port: Optional[int] = None
+
+    @property
+    def address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def dropped(self) -> bool:
+        return random.random() < self.drop_rate
+
+    async def delay(self) -> None:
+        latency = self.latency + random.uniform(0, self.jitter)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+
+class FakeJavaServer(FakeServerBase):
+    """Ответы на handshake, запрос статуса и ping по протоколу Java Edition"""
+
+    def __init__(self, players: int = 5, max_players: int = 100, sample_size: int = 12, motd_size: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.players = players
+        self.max_players = max_players
+        self.sample_size = sample_size
+        self.motd_size = motd_size
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "FakeJavaServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def status(self) -> dict:
+        sample = [
+            {"name": f"Player{i}", "id": f"00000000-0000-0000-0000-{i:012d}"}
+            for i in range(min(self.players, self.sample_size))
+        ]
+        return {
+            "version": {"name": "1.20.4", "protocol": 765},
+            "players": {"online": self.players, "max": self.max_players, "sample": sample},
+            "description": {"text": "Fake server " + "x" * self.motd_size},
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.requests += 1
+        try:
+            if self.dropped():
+                # Имитация недоступного сервера: соединение принято, ответа нет,
+                # пока клиент не закроет его по таймауту
+                while await reader.read(4096):
+                    pass
+                return
+            while True:
+                packet = await read_packet(reader)
+                packet_id, offset = read_varint(packet, 0)
+                if packet_id == 0 and len(packet) > 1:
+                    continue  # handshake
+                await self.delay()
+                if packet_id == 0:
+                    body = json.dumps(self.status()).encode("utf-8")
+                    writer.write(make_packet(0, write_varint(len(body)) + body))
+                elif packet_id == 1:
+                    writer.write(make_packet(1, packet[offset:offset + 8]))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class FakeBedrockServer(FakeServerBase, asyncio.DatagramProtocol):
+    """Ответ Unconnected Pong на Unconnected Ping (RakNet)"""
+
+    def __init__(self, players: int = 5, max_players: int = 100, **kwargs):
+        super().__init__(**kwargs)
+        self.players = players
+        self.max_players = max_players
+        self._transport: Optional[asyncio.DatagramTransport] = None
+
+    async def start(self) -> "FakeBedrockServer":
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(lambda: self, local_addr=("127.0.0.1", 0))
+        self.port = self._transport.get_extra_info("sockname")[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._transport:
+            self._transport.close()
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.requests += 1
+        if data[:1] != b"\x01" or self.dropped():
+            return
+        asyncio.ensure_future(self._reply(data, addr))
+
+    async def _reply(self, data: bytes, addr: Tuple[str, int]) -> None:
+        await self.delay()
+        motd = f"MCPE;Fake server;622;1.20.40;{self.players};{self.max_players};1;Bench;Survival;1;{self.port};"
+        name = motd.encode("utf-8")
+        pong = b"\x1c" + data[1:9] + struct.pack(">q", 1) + RAKNET_MAGIC + struct.pack(">H", len(name)) + name
+        if self._transport:
+            self._transport.sendto(pong, addr)
+
+
+class FakeRCONServer(FakeServerBase):
+    """RCON-сервер: ответы режутся на фрагменты по 4096 байт, на пакеты
+    неизвестного типа приходит "Unknown request".
+
+    При vanilla=True пакеты читаются как в RconClient ванильного сервера:
+    одно чтение до 1460 байт - один пакет, и если длина в заголовке не равна
+    прочитанному, соединение закрывается (склеенные пакеты считаются в rejected).
+    При vanilla=False поток разбирается по длине и принимает конвейер команд.
+    """
+
+    FRAGMENT = 4096
+    READ_SIZE = 1460
+
+    def __init__(self, password: str = "bench", response_size: int = 32, vanilla: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.password = password
+        self.response_size = response_size
+        self.vanilla = vanilla
+        self.rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> "FakeRCONServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        authenticated = False
+        try:
+            while True:
+                if self.vanilla:
+                    data = await reader.read(self.READ_SIZE)
+                    if len(data) < 10:
+                        break
+                    if struct.unpack("<i", data[:4])[0] != len(data) - 4:
+                        self.rejected += 1
+                        break
+                    data = data[4:]
+                else:
+                    size = struct.unpack("<i", await reader.readexactly(4))[0]
+                    data = await reader.readexactly(size)
+                request_id, ptype = struct.unpack("<2i", data[:8])
+                body = data[8:-2].decode("utf-8", errors="replace")
+
+                if ptype == 3:
+                    authenticated = body == self.password
+                    writer.write(rcon_packet(request_id if authenticated else -1, 2, b""))
+                elif not authenticated:
+                    writer.write(rcon_packet(-1, 2, b""))
+                elif ptype == 2:
+                    self.requests += 1
+                    if self.dropped():
+                        continue
+                    await self.delay()
+                    payload = (f"{body}: " + "x" * self.response_size)[:max(self.response_size, 1)].encode("utf-8")
+                    for start in range(0, len(payload), self.FRAGMENT):
+                        writer.write(rcon_packet(request_id, 0, payload[start:start + self.FRAGMENT]))
+                else:
+                    writer.write(rcon_packet(request_id, 0, f"Unknown request {ptype:x}".encode("utf-8")))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def start_all(servers: List[FakeServerBase]) -> List[FakeServerBase]:
+    return list(await asyncio.gather(*(server.start() for server in servers)))
+
+
+async def stop_all(servers: List[FakeServerBase]) -> None:
+    await asyncio.gather(*(server.stop() for server in servers))
+
+
+def rcon_packet(request_id: int, ptype: int, body: bytes) -> bytes:
+    body += b"\x00\x00"
+    return struct.pack("<3i", len(body) + 8, request_id, ptype) + body
+
+
+def write_varint(value: int) -> bytes:
+    result = bytearray()
+    value &= 0xFFFFFFFF
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            result.append(byte | 0x80)
+        else:
+            result.append(byte)
+            return bytes(result)
+
+
+def read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    result = 0
+    for shift in range(0, 35, 7):
+        byte = data[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+    raise ValueError("VarInt is too big")
+
+
+async def read_packet(reader: asyncio.StreamReader) -> bytes:
+    length = 0
+    for shift in range(0, 35, 7):
+        byte = (await reader.readexactly(1))[0]
+        length |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            break
+    return await reader.readexactly(length)
+
+
+def make_packet(packet_id: int, payload: bytes) -> bytes:
+    body = write_varint(packet_id) + payload
+    return write_varint(len(body)) + body
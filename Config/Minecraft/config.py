@@ -1,8 +1,39 @@
-import json
-from config import language
-
 useEmbed = False
-locate = f"Lang/Minecraft/minecraft_{language}.json"
-loc = json.load(open(locate,"r",encoding="utf-8"))
-save_path = "Saves/Minecraft/data.json"
-allowed_role_ids = ["id"]
\ No newline at end of file
+save_path = "Saves/Minecraft/data.json"  # Старый формат, переносится в db_path при первом запуске
+db_path = "Saves/Minecraft/data.db"
+save_delay = 2.0  # Задержка перед записью изменений на диск, сек
+allowed_role_ids = ["id"]
+
+# Опрос серверов
+poll_concurrency = 64  # Максимум одновременных запросов статуса
+probe_timeout = 5.0  # Предельное время опроса одного сервера, сек
+dns_min_ttl = 30.0  # Минимальное время жизни адреса в кэше DNS, сек
+dns_negative_ttl = 30.0  # Сколько помнить ошибку DNS перед повторной попыткой, сек
+status_ttl = 50.0  # Время жизни статуса в кэше, сек
+presence_max_age = 180.0  # Допустимый возраст статуса для статуса бота, сек
+
+# RCON
+rcon_timeout = 5.0  # Таймаут подключения и ответа RCON, сек
+rcon_idle_timeout = 300.0  # Через сколько секунд простоя закрывать соединение
+rcon_bulk_depth = 16  # Сколько команд из списка держать в полёте одновременно
+rcon_bulk_limit = 1000  # Максимум команд в одном списке
+rcon_broadcast_timeout = 10.0  # Таймаут ответа одного сервера при рассылке, сек
+# Несколько команд в полёте и пакет-маркер конца ответа. Ванильный сервер читает сокет
+# по одному пакету и рвёт соединение, получив два пакета разом, поэтому по умолчанию
+# выключено; включается для сервера командой /rcon_mode
+rcon_pipelining = False
+
+# Статистика
+stats_path = "Saves/Minecraft/stats.db"
+stats_raw_capacity = 240  # Сколько последних сырых замеров хранить в памяти на сервер
+stats_font = "DejaVuSans.ttf"  # TrueType-шрифт графиков с кириллицей; если не найден - встроенный шрифт Pillow
+
+# Расписание опроса
+poll_tick = 5  # Как часто проверять, каким серверам пора на опрос, сек
+poll_interval = 60.0  # Обычный интервал опроса сервера, сек
+poll_min_interval = 20.0  # Самый частый опрос для серверов с активностью, сек
+poll_max_interval = 1800.0  # Самый редкий опрос для долго лежащих серверов, сек
+player_events_interval = 30  # Как часто отправлять накопленные события входа/выхода игроков, сек
+player_offline_samples = 2  # Сколько опросов подряд сервер должен быть недоступен, чтобы закрыть сессии игроков
+rename_limit = 2  # Сколько раз можно переименовать канал за rename_window (лимит Discord - 2 за 10 минут)
+rename_window = 600.0  # Окно лимита переименований, сек
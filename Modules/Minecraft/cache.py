@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from Modules.Minecraft.poller import StatusPoller
+
+Key = Tuple[str, str]
+
+
+class StatusCache:
+    """Кэш статусов серверов по ключу (тип, адрес) с временем жизни записи.
+
+    Только кэш обращается к серверам: одновременные запросы одного адреса
+    ждут один и тот же опрос. on_probe вызывается с результатом каждого
+    настоящего опроса.
+    """
+
+    def __init__(self, poller: StatusPoller, ttl: float = 50.0,
+                 on_probe: Optional[Callable[[Key, dict], None]] = None):
+        self.poller = poller
+        self.ttl = ttl
+        self.on_probe = on_probe
+        self._entries: Dict[Key, Tuple[float, dict]] = {}
+        self._inflight: Dict[Key, asyncio.Future] = {}
+
+    def peek(self, server_type: str, address: str) -> Optional[dict]:
+        """Последний известный статус без опроса сервера"""
+        entry = self._entries.get((server_type, address))
+        return entry[1] if entry else None
+
+    async def get(self, server_type: str, address: str, max_age: Optional[float] = None) -> dict:
+        """Статус из кэша, если он не старше max_age, иначе свежий опрос"""
+        key = (server_type, address)
+        max_age = self.ttl if max_age is None else max_age
+
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[0] < max_age:
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(key))
+            self._inflight[key] = task
+        # Отмена одного ожидающего не должна отменять общий опрос
+        return await asyncio.shield(task)
+
+    async def get_many(self, targets: Iterable[Key], max_age: Optional[float] = None) -> Dict[Key, dict]:
+        """Статусы всех серверов сразу; одинаковые адреса опрашиваются один раз"""
+        targets = list(dict.fromkeys(targets))
+        results = await asyncio.gather(*(self.get(*target, max_age=max_age) for target in targets))
+        return dict(zip(targets, results))
+
+    def retain(self, keys: Iterable[Key]) -> None:
+        """Удаление записей серверов, которые больше не отслеживаются"""
+        keys = set(keys)
+        for key in list(self._entries):
+            if key not in keys:
+                del self._entries[key]
+
+    async def _refresh(self, key: Key) -> dict:
+        try:
+            result = await self.poller.probe(*key)
+            self._entries[key] = (time.monotonic(), result)
+            if self.on_probe is not None:
+                self.on_probe(key, result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
@@ -0,0 +1,106 @@
+import io
+import math
+import time
+from typing import List, Optional, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+from Modules.Minecraft.stats import Point
+
+WIDTH, HEIGHT = 900, 460
+MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, PANEL_GAP = 60, 20, 30, 40
+BACKGROUND = (43, 45, 49)
+GRID = (70, 72, 78)
+TEXT = (220, 221, 222)
+PLAYERS = (87, 242, 135)
+PLAYERS_MAX = (46, 125, 72)
+LATENCY = (88, 101, 242)
+OFFLINE = (120, 40, 40)
+
+
+def render_chart(title: str, points: List[Point], window: float,
+                 labels: Tuple[str, str, str] = ("Players", "Ping, ms", "No data"),
+                 font_path: Optional[str] = None) -> bytes:
+    """PNG-график игроков (сверху) и пинга (снизу) за окно window секунд.
+
+    labels - подписи панели игроков, панели пинга и пустого графика. Встроенный
+    шрифт Pillow не содержит кириллицы, поэтому для переведённых подписей
+    нужен TrueType-шрифт font_path; если его нет, используется встроенный.
+    """
+    image = Image.new("RGB", (WIDTH, HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    font = _font(font_path)
+    players_label, latency_label, empty_label = labels
+
+    draw.text((MARGIN_LEFT, 8), title, fill=TEXT, font=font)
+
+    end = time.time()
+    start = end - window
+    panel_height = (HEIGHT - MARGIN_TOP - PANEL_GAP * 2) // 2
+    players_top = MARGIN_TOP
+    latency_top = MARGIN_TOP + panel_height + PANEL_GAP
+
+    def x_of(timestamp: float) -> float:
+        return MARGIN_LEFT + (timestamp - start) / window * (WIDTH - MARGIN_LEFT - MARGIN_RIGHT)
+
+    # Периоды, когда сервер был оффлайн, закрашиваются на обеих панелях
+    step = (WIDTH - MARGIN_LEFT - MARGIN_RIGHT) / max(len(points), 1)
+    for timestamp, _, _, _, online in points:
+        if online == 0:
+            x = x_of(timestamp)
+            for top in (players_top, latency_top):
+                draw.rectangle((x, top, x + max(step, 1), top + panel_height), fill=OFFLINE)
+
+    players_max = max([point[2] for point in points] + [1])
+    _panel(draw, font, players_top, panel_height, players_max, players_label)
+    _line(draw, [(x_of(t), _y(players_top, panel_height, peak, players_max)) for t, _, peak, _, o in points if o],
+          PLAYERS_MAX)
+    _line(draw, [(x_of(t), _y(players_top, panel_height, avg, players_max)) for t, avg, _, _, o in points if o],
+          PLAYERS)
+
+    latencies = [point[3] for point in points if not math.isnan(point[3])]
+    latency_max = max(latencies + [1.0])
+    _panel(draw, font, latency_top, panel_height, latency_max, latency_label)
+    _line(draw, [(x_of(t), _y(latency_top, panel_height, lat, latency_max)) for t, _, _, lat, _ in points
+                 if not math.isnan(lat)], LATENCY)
+
+    for fraction in (0, 0.25, 0.5, 0.75, 1):
+        timestamp = start + window * fraction
+        label = time.strftime("%d.%m %H:%M" if window > 86400 else "%H:%M", time.localtime(timestamp))
+        draw.text((x_of(timestamp) - 15, HEIGHT - PANEL_GAP + 10), label, fill=TEXT, font=font)
+
+    if not points:
+        draw.text((WIDTH // 2 - 40, HEIGHT // 2), empty_label, fill=TEXT, font=font)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _font(path: Optional[str]):
+    if path:
+        try:
+            return ImageFont.truetype(path, 11)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def _y(top: int, height: int, value: float, maximum: float) -> float:
+    return top + height - value / maximum * height
+
+
+def _panel(draw: ImageDraw.ImageDraw, font, top: int, height: int, maximum: float, label: str) -> None:
+    for fraction in (0, 0.5, 1):
+        y = top + height - fraction * height
+        draw.line((MARGIN_LEFT, y, WIDTH - MARGIN_RIGHT, y), fill=GRID)
+        draw.text((5, y - 6), f"{maximum * fraction:.0f}", fill=TEXT, font=font)
+    draw.text((MARGIN_LEFT + 5, top + 2), label, fill=TEXT, font=font)
+
+
+def _line(draw: ImageDraw.ImageDraw, coords: List[tuple], color: tuple) -> None:
+    if len(coords) == 1:
+        x, y = coords[0]
+        draw.ellipse((x - 2, y - 2, x + 2, y + 2), fill=color)
+    elif coords:
+        draw.line(coords, fill=color, width=2)
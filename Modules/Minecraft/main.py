@@ -1,67 +1,185 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
-from mcstatus import JavaServer, BedrockServer
-from mcrcon import MCRcon
 from Config.Minecraft.config import *
+from Modules.Minecraft.poller import StatusPoller
+from Modules.Minecraft.resolver import AddressResolver
+from Modules.Minecraft.cache import StatusCache
+from Modules.Minecraft.storage import ServerStorage
+from Modules.Minecraft.stats import StatsStore, uptime
+from Modules.Minecraft.chart import render_chart
+from Modules.Minecraft.scheduler import PollScheduler
+from Modules.Minecraft.players import PlayerTracker, format_duration
+from Modules.Tools.rcon import RCONPool
+from Modules.Tools.metrics import metrics
+from Modules.Tools.reloader import take_over
+from Modules.Tools.gateway import owns_all_shards, owns_guild
+from Modules.Tools.i18n import i18n, Translator
 import json
-import os
+import hashlib
+import io
+import math
+import time
 import asyncio
-from typing import Optional, Literal
+import logging
+from typing import Dict, List, Optional, Literal, Tuple
+
+log = logging.getLogger(__name__)
+
+# События гейтвея, нужные модулю: каналы серверов и удаление сообщений со статусом
+INTENTS = ("guilds", "guild_messages")
+
+def render_fingerprint(embed: discord.Embed) -> str:
+    """Короткий отпечаток содержимого embed для сравнения с прошлой отрисовкой"""
+    payload = json.dumps(embed.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+def parse_tags(tags: str) -> List[str]:
+    return sorted({tag.strip().lower() for tag in tags.split(",") if tag.strip()})
+
+def duration(tr: Translator, seconds: float) -> str:
+    return format_duration(seconds, tr("duration.hours"), tr("duration.minutes"))
 
 class Minecraft(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.server_info = {}
-        self.data_file = save_path
-        self.load_data()
+        self.messages = {}
+        self.storage = ServerStorage(db_path, legacy_path=save_path, flush_delay=save_delay)
+        self.resolver = AddressResolver(timeout=probe_timeout, min_ttl=dns_min_ttl, negative_ttl=dns_negative_ttl)
+        self.poller = StatusPoller(concurrency=poll_concurrency, timeout=probe_timeout, resolver=self.resolver)
+        self.stats = StatsStore(stats_path, raw_capacity=stats_raw_capacity)
+        self.status_cache = StatusCache(self.poller, ttl=status_ttl, on_probe=self.stats.record)
+        self.rcon_pool = RCONPool(timeout=rcon_timeout, idle_timeout=rcon_idle_timeout)
+        self.scheduler = PollScheduler(
+            base_interval=poll_interval,
+            min_interval=poll_min_interval,
+            max_interval=poll_max_interval
+        )
+        self.players = PlayerTracker(player_offline_samples)
+        self.player_events = {}
+        # Старые записи без guild_id, канал которых ещё не появился в кэше этого процесса
+        self.unassigned = {}
+        self.presence = None
+        # Время последних переименований каналов и переименования, идущие в фоне
+        self.renames = {}
+        self.rename_tasks = {}
+        self.exported = False
+
+    async def cog_load(self):
+        state = take_over(self.bot, self.qualified_name)
+        if state is not None:
+            await self.import_state(state)
+        else:
+            self.server_info = self.claim(await self.storage.open())
+            await self.stats.open()
         self.update_embed.start()
         self.update_status.start()
+        self.post_player_events.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         self.update_embed.cancel()
         self.update_status.cancel()
-        self.save_data()
+        self.post_player_events.cancel()
+        # Фоновые переименования останавливаются и при горячей перезагрузке: иначе они
+        # сохранили бы сервер в закрытое хранилище или переименовали канал вместе с новым cog
+        tasks = list(self.rename_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.rename_tasks.clear()
+        if self.exported:
+            # Хранилища и соединения теперь принадлежат новому экземпляру
+            return
+        await self.storage.close()
+        await self.stats.close()
+        await self.rcon_pool.close()
 
-    def load_data(self):
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as f:
-                data = json.load(f)
-                self.server_info = {int(k): v for k, v in data.items()}
+    def export_state(self) -> dict:
+        """Состояние для нового экземпляра cog при горячей перезагрузке"""
+        self.exported = True
+        return {
+            "server_info": self.server_info,
+            "messages": self.messages,
+            "player_events": self.player_events,
+            "storage": self.storage,
+            "stats": self.stats,
+            "resolver": self.resolver,
+            "poller": self.poller,
+            "status_cache": self.status_cache,
+            "rcon_pool": self.rcon_pool,
+            "scheduler": self.scheduler,
+            "players": self.players,
+            "unassigned": self.unassigned,
+            "renames": self.renames
+        }
+
+    async def import_state(self, state: dict):
+        """Приём состояния прошлого экземпляра. Объект забирается, только если
+        его класс не перезагружался; иначе старый закрывается и создаётся новый."""
+        def adopt(name: str) -> bool:
+            if type(state.get(name)) is type(getattr(self, name)):
+                setattr(self, name, state.pop(name))
+                return True
+            return False
+
+        self.messages = state.pop("messages")
+        self.player_events = state.pop("player_events")
+        self.unassigned = state.pop("unassigned", {})
+        self.renames = state.pop("renames", {})
+        if adopt("storage"):
+            self.server_info = state.pop("server_info")
         else:
-            self.server_info = {}
+            await state.pop("storage").close()
+            self.server_info = self.claim(await self.storage.open())
+        if not adopt("stats"):
+            await state.pop("stats").close()
+            await self.stats.open()
+        # Кэш статусов, опросчик и резолвер связаны друг с другом и забираются вместе
+        if all(type(state[name]) is type(getattr(self, name)) for name in ("resolver", "poller", "status_cache")):
+            for name in ("resolver", "poller", "status_cache"):
+                adopt(name)
+        self.status_cache.on_probe = self.stats.record
+        if not adopt("rcon_pool"):
+            await state.pop("rcon_pool").close()
+        adopt("scheduler")
+        adopt("players")
 
-    def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.server_info, f, indent=4)
+    def claim(self, servers: Dict[int, dict]) -> Dict[int, dict]:
+        """Серверы, которые обслуживает этот процесс: их сервер Discord на шардах процесса.
 
-    async def get_server_status(self, server_type: str, address: str):
-        try:
-            if server_type == "java":
-                server = JavaServer.lookup(address)
-                status = server.status()
-                return {
-                    "online": True,
-                    "players": status.players.online,
-                    "max_players": status.players.max,
-                    "player_list": [player.name for player in status.players.sample] if hasattr(status.players, 'sample') and status.players.sample else [],
-                    "version": status.version.name,
-                    "latency": status.latency
-                }
-            elif server_type == "bedrock":
-                server = BedrockServer.lookup(address)
-                status = server.status()
-                return {
-                    "online": True,
-                    "players": status.players_online,
-                    "max_players": status.players_max,
-                    "player_list": [],
-                    "version": status.version.version,
-                    "latency": status.latency
-                }
-        except Exception:
-            return {"online": False}
+        Так при запуске нескольких процессов каждый сервер опрашивается и
+        обновляется ровно одним из них. Записи без guild_id откладываются в
+        self.unassigned, пока их канал не появится в кэше.
+        """
+        owned = {}
+        for channel_id, server_data in servers.items():
+            if server_data.get("guild_id") is not None:
+                if owns_guild(self.bot, server_data["guild_id"]):
+                    owned[channel_id] = server_data
+            elif owns_all_shards(self.bot):
+                owned[channel_id] = server_data
+            else:
+                self.unassigned[channel_id] = server_data
+        return owned
+
+    def is_leader(self) -> bool:
+        """Процесс выполняет общие задачи: статус бота и чистку статистики"""
+        lease = getattr(self.bot, "lease", None)
+        return lease is None or lease.is_leader
+
+    def save_server(self, channel_id: int):
+        """Отложенное сохранение одного сервера (или его удаление, если он больше не отслеживается)"""
+        if channel_id in self.server_info:
+            self.storage.save(channel_id, self.server_info[channel_id])
+        else:
+            self.storage.delete(channel_id)
+
+    @metrics.timed("minecraft_status")
+    async def get_server_status(self, server_type: str, address: str, max_age: Optional[float] = None):
+        return await self.status_cache.get(server_type, address, max_age=max_age)
 
+    @metrics.timed("rcon_command")
     async def execute_rcon(self, channel_id: int, command: str):
         if channel_id not in self.server_info:
             return None
@@ -71,16 +189,74 @@ class Minecraft(commands.Cog):
             return None
         
         try:
-            with MCRcon(
+            return await self.rcon_pool.execute(
                 server_data["address"].split(":")[0],
+                server_data["rcon"].get("port", 25575),
                 server_data["rcon"]["password"],
-                port=server_data["rcon"].get("port", 25575)
-            ) as mcr:
-                return mcr.command(command)
+                command,
+                pipelined=server_data["rcon"].get("pipelining", rcon_pipelining)
+            )
         except Exception as e:
-            print(f"RCON error: {e}")
+            log.warning(f"RCON error: {e}", extra={"channel_id": channel_id})
+            return None
+
+    @metrics.timed("rcon_bulk")
+    async def execute_rcon_many(self, channel_id: int, commands: List[str], tr: Translator) -> Optional[List[Tuple[str, str, bool]]]:
+        """Выполнение пачки команд через одну RCON-сессию: (команда, ответ, успех)"""
+        if channel_id not in self.server_info:
+            return None
+
+        server_data = self.server_info[channel_id]
+        if "rcon" not in server_data or not server_data["rcon"].get("enabled", False):
             return None
 
+        results = await self.rcon_pool.execute_many(
+            server_data["address"].split(":")[0],
+            server_data["rcon"].get("port", 25575),
+            server_data["rcon"]["password"],
+            commands,
+            depth=rcon_bulk_depth,
+            pipelined=server_data["rcon"].get("pipelining", rcon_pipelining)
+        )
+        return [
+            (command, tr("error.result", result), False) if isinstance(result, Exception) else (command, result, True)
+            for command, result in zip(commands, results)
+        ]
+
+    async def broadcast_rcon(self, command: str, tr: Translator, tag: Optional[str] = None) -> List[Tuple[int, str, float, str, bool]]:
+        """Параллельная отправка команды на все серверы с RCON (или с тегом tag).
+
+        Возвращает (канал, адрес, задержка в мс, ответ, успех) для каждого сервера;
+        ошибка или таймаут одного сервера не задерживают остальные.
+        """
+        targets = [
+            (channel_id, server_data) for channel_id, server_data in self.server_info.items()
+            if server_data.get("rcon", {}).get("enabled", False)
+            and (tag is None or tag in server_data.get("tags", []))
+        ]
+
+        async def run(channel_id: int, server_data: dict):
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    self.rcon_pool.execute(
+                        server_data["address"].split(":")[0],
+                        server_data["rcon"].get("port", 25575),
+                        server_data["rcon"]["password"],
+                        command,
+                        pipelined=server_data["rcon"].get("pipelining", rcon_pipelining)
+                    ),
+                    timeout=rcon_broadcast_timeout
+                )
+                ok = True
+            except asyncio.TimeoutError:
+                result, ok = tr("error.timeout"), False
+            except Exception as e:
+                result, ok = tr("error.result", e), False
+            return channel_id, server_data["address"], (time.perf_counter() - start) * 1000, result, ok
+
+        return await asyncio.gather(*(run(channel_id, server_data) for channel_id, server_data in targets))
+
     @app_commands.command(name="add_server", description="Добавить новый сервер для отслеживания")
     @app_commands.describe(
         channel="Канал для отображения статуса",
@@ -88,7 +264,9 @@ class Minecraft(commands.Cog):
         server_type="Тип сервера",
         show_players="Показывать список игроков",
         show_in_status="Показывать в статусе бота",
-        display_in_status="Что показывать в статусе бота"
+        display_in_status="Что показывать в статусе бота",
+        tags="Теги сервера через запятую (для /broadcast)",
+        interval="Интервал опроса в секундах (по умолчанию подбирается автоматически)"
     )
     async def add_server(
         self,
@@ -98,12 +276,15 @@ class Minecraft(commands.Cog):
         server_type: Literal["java", "bedrock"] = "java",
         show_players: bool = True,
         show_in_status: bool = False,
-        display_in_status: Literal["players", "ip"] = "players"
+        display_in_status: Literal["players", "ip"] = "players",
+        tags: str = "",
+        interval: Optional[app_commands.Range[int, 15, 3600]] = None
     ):
+        tr = i18n.for_interaction("Minecraft", interaction)
         if not any(role.id in allowed_role_ids for role in interaction.user.roles):
             embed = discord.Embed(
-                title="Ошибка",
-                description="У вас недостаточно прав для выполнения этой команды.",
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -111,8 +292,8 @@ class Minecraft(commands.Cog):
 
         if channel.id in self.server_info:
             embed = discord.Embed(
-                title="Ошибка",
-                description="Этот канал уже привязан к серверу.",
+                title=tr("error.title"),
+                description=tr("error.channel_taken"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -124,8 +305,8 @@ class Minecraft(commands.Cog):
                 port = int(port)
             except ValueError:
                 embed = discord.Embed(
-                    title="Ошибка",
-                    description="Неверный формат порта в адресе сервера.",
+                    title=tr("error.title"),
+                    description=tr("error.bad_port"),
                     color=discord.Color.red()
                 )
                 await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -134,6 +315,7 @@ class Minecraft(commands.Cog):
             address = f"{address}:25565" if server_type == "java" else f"{address}:19132"
 
         self.server_info[channel.id] = {
+            "guild_id": channel.guild.id,
             "address": address,
             "type": server_type,
             "players": show_players,
@@ -142,25 +324,25 @@ class Minecraft(commands.Cog):
             "show_in_status": show_in_status,
             "display_in_status": display_in_status,
             "rename_channel": True,
-            "rcon": {"enabled": False}
+            "rcon": {"enabled": False},
+            "tags": parse_tags(tags),
+            "interval": interval
         }
 
-        self.save_data()
-
         embed = discord.Embed(
-            title=f"Сервер {address}",
-            description="Получение информации о сервере...",
+            title=tr("embed.pending.title", address),
+            description=tr("embed.pending.description"),
             color=discord.Color.orange()
         )
         message = await channel.send(embed=embed)
         self.server_info[channel.id]["message"] = message.id
-        self.save_data()
 
         await self.update_server_embed(channel)
+        self.save_server(channel.id)
 
         embed = discord.Embed(
-            title="Сервер добавлен",
-            description=f"Сервер {address} ({server_type}) успешно добавлен в канал {channel.mention}.",
+            title=tr("embed.added.title"),
+            description=tr("embed.added.description", address, server_type, channel.mention),
             color=discord.Color.green()
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -169,10 +351,11 @@ class Minecraft(commands.Cog):
     @app_commands.command(name="command", description="Выполнить команду на сервере")
     @app_commands.describe(command="Команда для выполнения (без /)")
     async def server_command(self, interaction: discord.Interaction, command: str):
+        tr = i18n.for_interaction("Minecraft", interaction)
         if not any(role.id in allowed_role_ids for role in interaction.user.roles):
             embed = discord.Embed(
-                title="Ошибка",
-                description="У вас недостаточно прав для выполнения этой команды.",
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -180,8 +363,8 @@ class Minecraft(commands.Cog):
 
         if interaction.channel.id not in self.server_info:
             embed = discord.Embed(
-                title="Ошибка",
-                description="Этот канал не привязан к серверу.",
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -190,16 +373,16 @@ class Minecraft(commands.Cog):
         server_data = self.server_info[interaction.channel.id]
         if "rcon" not in server_data or not server_data["rcon"].get("enabled", False):
             embed = discord.Embed(
-                title="Ошибка",
-                description="RCON не настроен для этого сервера.",
+                title=tr("error.title"),
+                description=tr("error.rcon_disabled"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
         embed = discord.Embed(
-            title="Команда отправлена",
-            description=f"Команда `{command}` отправлена на сервер.",
+            title=tr("command.sent_title"),
+            description=tr("command.sent_description", command),
             color=discord.Color.green()
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -210,22 +393,382 @@ class Minecraft(commands.Cog):
             log_channel = self.bot.get_channel(server_data["rcon"]["log_channel"])
             if log_channel:
                 log_embed = discord.Embed(
-                    title="Выполнена RCON команда",
+                    title=tr("rcon_log.command_title"),
                     color=discord.Color.blue()
                 )
-                log_embed.add_field(name="Сервер", value=server_data["address"], inline=False)
-                log_embed.add_field(name="Пользователь", value=interaction.user.mention, inline=False)
-                log_embed.add_field(name="Команда", value=f"`/{command}`", inline=False)
+                log_embed.add_field(name=tr("rcon_log.server"), value=server_data["address"], inline=False)
+                log_embed.add_field(name=tr("rcon_log.user"), value=interaction.user.mention, inline=False)
+                log_embed.add_field(name=tr("rcon_log.command"), value=f"`/{command}`", inline=False)
                 if result:
-                    log_embed.add_field(name="Результат", value=f"```{result[:1000]}```", inline=False)
+                    log_embed.add_field(name=tr("rcon_log.result"), value=f"```{result[:1000]}```", inline=False)
                 await log_channel.send(embed=log_embed)
 
+    @app_commands.command(name="command_bulk", description="Выполнить список команд на сервере")
+    @app_commands.describe(file="Текстовый файл с командами, по одной в строке (без файла откроется форма)")
+    async def server_command_bulk(self, interaction: discord.Interaction, file: Optional[discord.Attachment] = None):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if interaction.channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        server_data = self.server_info[interaction.channel.id]
+        if "rcon" not in server_data or not server_data["rcon"].get("enabled", False):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.rcon_disabled"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if file is None:
+            await interaction.response.send_modal(BulkCommandModal(self, tr))
+            return
+
+        text = (await file.read()).decode("utf-8", errors="replace")
+        await self.run_bulk_commands(interaction, text)
+
+    async def run_bulk_commands(self, interaction: discord.Interaction, text: str):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        commands = [
+            line.strip().lstrip("/") for line in text.splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+        if not commands or len(commands) > rcon_bulk_limit:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.bulk_count", rcon_bulk_limit),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        channel_id = interaction.channel.id
+        results = await self.execute_rcon_many(channel_id, commands, tr)
+        if results is None:
+            await interaction.followup.send(tr("error.rcon_disabled"), ephemeral=True)
+            return
+
+        failed = sum(1 for _, _, ok in results if not ok)
+        report = "\n".join(f"/{command}\n{result}\n" for command, result, _ in results).encode("utf-8")
+
+        embed = discord.Embed(
+            title=tr("bulk.title"),
+            description=tr("bulk.description", len(results) - failed, len(results)),
+            color=discord.Color.green() if not failed else discord.Color.orange()
+        )
+        await interaction.followup.send(
+            embed=embed,
+            file=discord.File(io.BytesIO(report), filename="rcon_results.txt"),
+            ephemeral=True
+        )
+
+        # Одна запись в лог на всю пачку вместо записи на каждую команду
+        server_data = self.server_info.get(channel_id, {})
+        if server_data.get("rcon", {}).get("log_channel"):
+            log_channel = self.bot.get_channel(server_data["rcon"]["log_channel"])
+            if log_channel:
+                log_embed = discord.Embed(
+                    title=tr("rcon_log.bulk_title"),
+                    color=discord.Color.blue()
+                )
+                log_embed.add_field(name=tr("rcon_log.server"), value=server_data["address"], inline=False)
+                log_embed.add_field(name=tr("rcon_log.user"), value=interaction.user.mention, inline=False)
+                log_embed.add_field(name=tr("rcon_log.commands"), value=tr("rcon_log.count", len(results), failed), inline=False)
+                await log_channel.send(
+                    embed=log_embed,
+                    file=discord.File(io.BytesIO(report), filename="rcon_results.txt")
+                )
+
+    @app_commands.command(name="broadcast", description="Выполнить команду на всех серверах с RCON")
+    @app_commands.describe(command="Команда для выполнения (без /)", tag="Только серверы с этим тегом")
+    async def server_broadcast(self, interaction: discord.Interaction, command: str, tag: Optional[str] = None):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        command = command.lstrip("/")
+        tag = tag.strip().lower() if tag else None
+        results = await self.broadcast_rcon(command, tr, tag)
+        if not results:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_rcon_servers_tag", tag) if tag else tr("error.no_rcon_servers"),
+                color=discord.Color.red()
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            return
+
+        failed = sum(1 for *_, ok in results if not ok)
+        width = max(len(address) for _, address, *_ in results)
+        ms = tr("broadcast.ms")
+        table = "\n".join(
+            f"{'OK ' if ok else 'ERR'} {address:<{width}} {latency:>6.0f}{ms}  {result.splitlines()[0][:60] if result else '-'}"
+            for _, address, latency, result, ok in sorted(results, key=lambda row: row[1])
+        )
+
+        embed = discord.Embed(
+            title=tr("broadcast.title", command),
+            description=tr("broadcast.description", len(results) - failed, len(results)),
+            color=discord.Color.green() if not failed else discord.Color.orange()
+        )
+        report = "\n\n".join(
+            f"[{'OK' if ok else 'ERR'}] {address} ({latency:.0f}{ms})\n{result}"
+            for _, address, latency, result, ok in results
+        ).encode("utf-8")
+        files = [discord.File(io.BytesIO(report), filename="broadcast_results.txt")]
+        if len(table) <= 3800:
+            embed.description += f"\n```{table}```"
+        await interaction.followup.send(embed=embed, files=files, ephemeral=True)
+
+        # По одной записи в каждый лог-канал, а не по записи на сервер
+        log_channel_ids = {
+            self.server_info[channel_id]["rcon"]["log_channel"]
+            for channel_id, *_ in results
+            if self.server_info.get(channel_id, {}).get("rcon", {}).get("log_channel")
+        }
+        for log_channel_id in log_channel_ids:
+            log_channel = self.bot.get_channel(log_channel_id)
+            if log_channel:
+                log_embed = discord.Embed(
+                    title=tr("rcon_log.broadcast_title"),
+                    color=discord.Color.blue()
+                )
+                log_embed.add_field(name=tr("rcon_log.servers"), value=tr("rcon_log.count", len(results), failed), inline=False)
+                log_embed.add_field(name=tr("rcon_log.user"), value=interaction.user.mention, inline=False)
+                log_embed.add_field(name=tr("rcon_log.command"), value=f"`/{command}`", inline=False)
+                await log_channel.send(embed=log_embed)
+
+    @app_commands.command(name="server_tags", description="Изменить теги сервера")
+    @app_commands.describe(channel="Канал сервера", tags="Теги через запятую (пусто - убрать все)")
+    async def server_tags(self, interaction: discord.Interaction, channel: discord.TextChannel, tags: str = ""):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        self.server_info[channel.id]["tags"] = parse_tags(tags)
+        self.save_server(channel.id)
+
+        embed = discord.Embed(
+            title=tr("tags.title"),
+            description=tr("tags.description", ", ".join(self.server_info[channel.id]["tags"]) or tr("tags.none")),
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="rcon_mode", description="Режим RCON сервера: ванильный или с конвейером команд")
+    @app_commands.describe(
+        channel="Канал сервера",
+        mode="vanilla - по одной команде (ванильный сервер), pipelined - несколько команд сразу"
+    )
+    async def rcon_mode(self, interaction: discord.Interaction, channel: discord.TextChannel, mode: Literal["vanilla", "pipelined"]):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        # Соединения пула различаются режимом, так что новое откроется при следующей команде
+        self.server_info[channel.id].setdefault("rcon", {"enabled": False})["pipelining"] = mode == "pipelined"
+        self.save_server(channel.id)
+
+        embed = discord.Embed(
+            title=tr("rcon_mode.title"),
+            description=tr(f"rcon_mode.{mode}"),
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="server_stats", description="График игроков и пинга сервера")
+    @app_commands.describe(window="Период графика")
+    async def server_stats(self, interaction: discord.Interaction, window: Literal["1h", "6h", "24h", "7d", "30d"] = "24h"):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if interaction.channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        server_data = self.server_info[interaction.channel.id]
+        key = (server_data.get("type", "java"), server_data["address"])
+        seconds = {"1h": 3600, "6h": 6 * 3600, "24h": 86400, "7d": 7 * 86400, "30d": 30 * 86400}[window]
+        points = await self.stats.series(key, seconds)
+        # Отрисовка занимает процессор, поэтому выполняется вне цикла событий
+        labels = (tr("stats.chart_players"), tr("stats.chart_ping"), tr("stats.chart_no_data"))
+        image = await asyncio.to_thread(
+            render_chart, f"{server_data['address']} - {window}", points, seconds, labels, stats_font
+        )
+
+        online = [point for point in points if not math.isnan(point[3])]
+        embed = discord.Embed(
+            title=tr("stats.title", server_data["address"], window),
+            color=discord.Color.blue()
+        )
+        embed.add_field(name=tr("stats.max_players"), value=str(max((point[2] for point in online), default=0)))
+        embed.add_field(
+            name=tr("stats.avg_ping"),
+            value=tr("stats.ping", sum(point[3] for point in online) / len(online)) if online else "-"
+        )
+        embed.add_field(
+            name=tr("stats.uptime"),
+            value=f"{uptime(points) * 100:.1f}%" if points else "-"
+        )
+        embed.set_image(url="attachment://stats.png")
+        await interaction.followup.send(
+            embed=embed, file=discord.File(io.BytesIO(image), filename="stats.png"), ephemeral=True
+        )
+
+    @app_commands.command(name="server_events", description="Канал для событий входа и выхода игроков")
+    @app_commands.describe(events_channel="Канал для событий (пусто - отключить)")
+    async def server_events(self, interaction: discord.Interaction, events_channel: Optional[discord.TextChannel] = None):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if interaction.channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        self.server_info[interaction.channel.id]["events_channel"] = events_channel.id if events_channel else None
+        self.save_server(interaction.channel.id)
+
+        embed = discord.Embed(
+            title=tr("events.title"),
+            description=tr("events.enabled", events_channel.mention) if events_channel else tr("events.disabled"),
+            color=discord.Color.green()
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="players", description="Игроки онлайн и время игры")
+    async def server_players(self, interaction: discord.Interaction):
+        tr = i18n.for_interaction("Minecraft", interaction)
+        if not any(role.id in allowed_role_ids for role in interaction.user.roles):
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if interaction.channel.id not in self.server_info:
+            embed = discord.Embed(
+                title=tr("error.title"),
+                description=tr("error.channel_not_bound"),
+                color=discord.Color.red()
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        server_data = self.server_info[interaction.channel.id]
+        online = self.players.online(interaction.channel.id)
+        top = self.players.top(interaction.channel.id)
+
+        embed = discord.Embed(
+            title=tr("players.title", server_data["address"]),
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name=tr("players.online", len(online)),
+            value="\n".join(
+                tr("players.online_row", discord.utils.escape_markdown(name), int(since)) for name, since in online[:25]
+            ) or tr("players.no_data"),
+            inline=False
+        )
+        embed.add_field(
+            name=tr("players.top"),
+            value="\n".join(
+                f"{discord.utils.escape_markdown(name)} - {duration(tr, total)}" for name, total in top
+            ) or tr("players.no_data"),
+            inline=False
+        )
+        embed.set_footer(text=tr("players.footer"))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="server_list", description="Показать список всех отслеживаемых серверов")
     async def server_list(self, interaction: discord.Interaction):
+        tr = i18n.for_interaction("Minecraft", interaction)
         if not any(role.id in allowed_role_ids for role in interaction.user.roles):
             embed = discord.Embed(
-                title="Ошибка",
-                description="У вас недостаточно прав для выполнения этой команды.",
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -233,35 +776,43 @@ class Minecraft(commands.Cog):
 
         if not self.server_info:
             embed = discord.Embed(
-                title="Список серверов",
-                description="Нет отслеживаемых серверов.",
+                title=tr("server_list.empty_title"),
+                description=tr("error.no_servers"),
                 color=discord.Color.blue()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
         embed = discord.Embed(
-            title="Список отслеживаемых серверов",
+            title=tr("server_list.title"),
             color=discord.Color.blue()
         )
 
         for channel_id, server_data in self.server_info.items():
             channel = self.bot.get_channel(channel_id)
-            channel_name = f"Удалённый канал ({channel_id})" if channel is None else channel.mention
+            channel_name = tr("server_list.deleted_channel", channel_id) if channel is None else channel.mention
             
             server_type = server_data.get("type", "java").upper()
-            rcon_status = "Включён" if server_data.get("rcon", {}).get("enabled", False) else "Выключен"
-            status_display = "IP" if server_data.get("display_in_status", "players") == "ip" else "Игроки"
+            rcon_status = tr("server_list.enabled") if server_data.get("rcon", {}).get("enabled", False) else tr("server_list.disabled")
+            status_display = tr("server_list.ip") if server_data.get("display_in_status", "players") == "ip" else tr("server_list.players")
+
+            status = self.status_cache.peek(server_data.get("type", "java"), server_data["address"])
+            if status and status["online"]:
+                last_status = f"online ({status['players']}/{status['max_players']})"
+            else:
+                last_status = server_data.get("last_status") or tr("server_list.unknown")
             
             embed.add_field(
-                name=f"{server_type} Сервер: {server_data['address']}",
-                value=(
-                    f"Канал: {channel_name}\n"
-                    f"Статус: {server_data.get('last_status', 'неизвестно')}\n"
-                    f"Отображение игроков: {'Да' if server_data['players'] else 'Нет'}\n"
-                    f"RCON: {rcon_status}\n"
-                    f"В статусе бота: {'Да' if server_data.get('show_in_status', False) else 'Нет'}\n"
-                    f"Отображать в статусе: {status_display}"
+                name=tr("server_list.field_name", server_type, server_data["address"]),
+                value=tr(
+                    "server_list.field_value",
+                    channel_name,
+                    last_status,
+                    tr("server_list.yes") if server_data["players"] else tr("server_list.no"),
+                    rcon_status,
+                    tr("server_list.yes") if server_data.get("show_in_status", False) else tr("server_list.no"),
+                    status_display,
+                    ", ".join(server_data.get("tags", [])) or tr("tags.none")
                 ),
                 inline=False
             )
@@ -270,10 +821,11 @@ class Minecraft(commands.Cog):
 
     @app_commands.command(name="action", description="Управление сервером")
     async def server_action(self, interaction: discord.Interaction):
+        tr = i18n.for_interaction("Minecraft", interaction)
         if not any(role.id in allowed_role_ids for role in interaction.user.roles):
             embed = discord.Embed(
-                title="Ошибка",
-                description="У вас недостаточно прав для выполнения этой команды.",
+                title=tr("error.title"),
+                description=tr("error.no_permission"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -281,24 +833,26 @@ class Minecraft(commands.Cog):
 
         if not self.server_info:
             embed = discord.Embed(
-                title="Ошибка",
-                description="Нет отслеживаемых серверов.",
+                title=tr("error.title"),
+                description=tr("error.no_servers"),
                 color=discord.Color.red()
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
         view = discord.ui.View()
-        view.add_item(ServerSelectDropdown(self, self.server_info))
+        view.add_item(ServerSelectDropdown(self, self.server_info, tr))
         await interaction.response.send_message(
-            "Выберите сервер для управления:",
+            tr("action.select"),
             view=view,
             ephemeral=True
         )
 
-    async def update_server_embed(self, channel):
+    @metrics.timed("minecraft_embed_update")
+    async def update_server_embed(self, channel, status: Optional[dict] = None) -> bool:
+        """Обновление сообщения и названия канала; True, если что-то было отправлено в Discord"""
         if channel.id not in self.server_info:
-            return
+            return False
 
         server_data = self.server_info[channel.id]
         address = server_data["address"]
@@ -306,109 +860,255 @@ class Minecraft(commands.Cog):
         player_list = server_data["players"]
         last_status = server_data["last_status"]
 
-        status = await self.get_server_status(server_type, address)
+        if status is None:
+            status = await self.get_server_status(server_type, address)
 
+        tr = i18n.for_guild("Minecraft", channel.guild)
         if status["online"]:
             players_online = status["players"]
             players_max = status["max_players"]
             players = status["player_list"]
             version = status["version"]
-            latency = int(status["latency"])
+            # Пинг округляется, чтобы дрожание в пару миллисекунд не вызывало правку сообщения
+            latency = int(round(status["latency"], -1))
 
             embed = discord.Embed(
-                title=f"Сервер {address} онлайн",
-                description=f"**Версия:** {version}\n**Игроков:** {players_online}/{players_max}\n**Пинг:** {latency}мс",
+                title=tr("embed.update.online.title", address),
+                description=tr("embed.update.online.description", version, players_online, players_max, latency),
                 color=discord.Color.green()
             )
             
             if player_list and players:
                 embed.add_field(
-                    name="Игроки онлайн:",
-                    value="\n".join(players) if players else "Информация недоступна",
+                    name=tr("embed.update.online.players_list_field.name"),
+                    value="\n".join(players) if players else tr("embed.update.online.players_list_field.no_info"),
                     inline=False
                 )
 
-            if server_data.get("rename_channel", True):
-                try:
-                    await channel.edit(name=f"mc-{address.replace(':', '-')}-online")
-                except:
-                    pass
-
             server_data["last_status"] = "online"
+            server_data["online_players"] = players_online
         else:
             embed = discord.Embed(
-                title=f"Сервер {address} оффлайн",
-                description="Сервер не отвечает или недоступен.",
+                title=tr("embed.update.offline.title", address),
+                description=tr("embed.update.offline.description"),
                 color=discord.Color.red()
             )
-            
-            if server_data.get("rename_channel", True):
-                try:
-                    await channel.edit(name=f"mc-{address.replace(':', '-')}-offline")
-                except:
-                    pass
 
             server_data["last_status"] = "offline"
+            server_data["online_players"] = 0
+
+        changed = False
+
+        if server_data.get("rename_channel", True):
+            # Запрос отправляется только при смене имени
+            channel_name = f"mc-{address.replace(':', '-')}-{server_data['last_status']}"
+            if server_data.get("channel_name") != channel_name:
+                self.schedule_rename(channel, channel_name)
+
+        fingerprint = render_fingerprint(embed)
+        if server_data["message"] is not None and server_data.get("fingerprint") == fingerprint:
+            return changed
 
         try:
-            if server_data["message"] is None:
+            message = self.get_server_message(channel)
+            if message is None:
                 message = await channel.send(embed=embed)
                 server_data["message"] = message.id
-                self.save_data()
             else:
-                try:
-                    message = await channel.fetch_message(server_data["message"])
-                    await message.edit(embed=embed)
-                except discord.NotFound:
-                    message = await channel.send(embed=embed)
-                    server_data["message"] = message.id
-                    self.save_data()
-                except discord.Forbidden:
-                    pass
+                await message.edit(embed=embed)
+            server_data["fingerprint"] = fingerprint
+            changed = True
+        except discord.NotFound:
+            # Сообщение удалено, пока бот не видел событие удаления
+            self.remove_server(channel.id)
+            return True
+        except discord.Forbidden:
+            pass
         except Exception as e:
-            print(f"Ошибка обновления embed: {e}")
+            log.error(f"Ошибка обновления embed: {e}", extra={"channel_id": channel.id})
+        return changed
+
+    def schedule_rename(self, channel, name: str):
+        """Переименование канала в фоне, не чаще rename_limit раз за rename_window.
+
+        Discord разрешает 2 переименования за 10 минут, а при превышении
+        discord.py ждёт снятия лимита прямо в вызове - до 10 минут. Поэтому проход
+        опроса переименования не ждёт, а внутри окна они откладываются: имя
+        сравнивается заново при следующем опросе сервера.
+        """
+        task = self.rename_tasks.get(channel.id)
+        if task is not None and not task.done():
+            return
+        now = time.monotonic()
+        recent = [renamed_at for renamed_at in self.renames.get(channel.id, []) if now - renamed_at < rename_window]
+        self.renames[channel.id] = recent
+        if len(recent) >= rename_limit:
+            return
+        recent.append(now)
+        self.rename_tasks[channel.id] = asyncio.ensure_future(self.rename_channel(channel, name))
+
+    async def rename_channel(self, channel, name: str):
+        try:
+            await channel.edit(name=name)
+        except discord.HTTPException as e:
+            log.warning(f"Ошибка переименования канала: {e}", extra={"channel_id": channel.id})
+            return
+        finally:
+            self.rename_tasks.pop(channel.id, None)
+        server_data = self.server_info.get(channel.id)
+        if server_data is not None:
+            server_data["channel_name"] = name
+            self.save_server(channel.id)
+
+    def get_server_message(self, channel) -> Optional[discord.PartialMessage]:
+        """Закэшированная ссылка на сообщение сервера без запроса к API"""
+        message_id = self.server_info[channel.id]["message"]
+        if message_id is None:
+            return None
+        message = self.messages.get(channel.id)
+        if message is None or message.id != message_id:
+            message = channel.get_partial_message(message_id)
+            self.messages[channel.id] = message
+        return message
 
-    @tasks.loop(minutes=1)
+    def remove_server(self, channel_id: int):
+        self.server_info.pop(channel_id, None)
+        self.messages.pop(channel_id, None)
+        self.renames.pop(channel_id, None)
+        self.save_server(channel_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        server_data = self.server_info.get(payload.channel_id)
+        if server_data and server_data["message"] == payload.message_id:
+            self.remove_server(payload.channel_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        server_data = self.server_info.get(payload.channel_id)
+        if server_data and server_data["message"] in payload.message_ids:
+            self.remove_server(payload.channel_id)
+
+    @tasks.loop(seconds=poll_tick)
     async def update_embed(self):
+        # Необработанное исключение остановило бы tasks.loop навсегда
+        try:
+            await self.sweep()
+        except Exception as e:
+            log.exception(f"Ошибка прохода опроса: {e}")
+
+    @metrics.timed("minecraft_sweep")
+    async def sweep(self):
         channels_to_remove = []
+        channels = []
+
+        # Запись без guild_id забирает процесс, в кэше которого есть её канал
+        for channel_id in [channel_id for channel_id in self.unassigned if self.bot.get_channel(channel_id)]:
+            self.server_info[channel_id] = self.unassigned.pop(channel_id)
         
-        for channel_id in list(self.server_info.keys()):
+        # Каждый проход опрашивает только серверы, чьё время по расписанию подошло
+        for channel_id in self.scheduler.due(list(self.server_info.keys())):
             channel = self.bot.get_channel(channel_id)
             if channel is None:
                 channels_to_remove.append(channel_id)
                 continue
-            
-            server_data = self.server_info[channel_id]
-            if server_data["message"] is not None:
-                try:
-                    await channel.fetch_message(server_data["message"])
-                except discord.NotFound:
-                    channels_to_remove.append(channel_id)
-                    continue
-                except discord.Forbidden:
-                    pass
-            
-            await self.update_server_embed(channel)
+            if self.server_info[channel_id].get("guild_id") is None:
+                self.server_info[channel_id]["guild_id"] = channel.guild.id
+                self.save_server(channel_id)
+            channels.append(channel)
+
+        # Ключ запоминается до опроса: пока идёт опрос, адрес могут поменять в настройках
+        keys = {
+            channel.id: (self.server_info[channel.id].get("type", "java"), self.server_info[channel.id]["address"])
+            for channel in channels
+        }
+
+        # Все серверы опрашиваются одновременно, так что проход занимает
+        # примерно столько же, сколько ответ самого медленного сервера
+        statuses = await self.status_cache.get_many(keys.values(), max_age=0)
+
+        for channel in channels:
+            server_data = self.server_info.get(channel.id)
+            if server_data is None:
+                continue
+            try:
+                status = statuses[keys[channel.id]]
+                self.scheduler.report(channel.id, status, server_data.get("interval"))
+
+                joined, left = self.players.update(channel.id, status)
+                if server_data.get("events_channel") and (joined or left):
+                    self.queue_player_events(server_data, joined, left)
+            except Exception as e:
+                log.error(f"Ошибка обработки статуса сервера: {e}", extra={"channel_id": channel.id})
+
+        channels = [channel for channel in channels if channel.id in self.server_info]
+        results = await asyncio.gather(
+            *(self.update_server_embed(channel, statuses[keys[channel.id]]) for channel in channels),
+            return_exceptions=True
+        )
+
+        # Сохраняются только серверы, у которых что-то изменилось
+        for channel, result in zip(channels, results):
+            if isinstance(result, Exception):
+                log.error(f"Ошибка обновления сервера: {result}", extra={"channel_id": channel.id})
+            elif result:
+                self.save_server(channel.id)
         
         for channel_id in channels_to_remove:
-            del self.server_info[channel_id]
-        
-        if channels_to_remove:
-            self.save_data()
+            self.remove_server(channel_id)
+
+        keys = [(server_data.get("type", "java"), server_data["address"]) for server_data in self.server_info.values()]
+        self.status_cache.retain(keys)
+        self.resolver.retain(keys)
+        self.stats.retain(keys)
+        self.scheduler.retain(self.server_info.keys())
+        self.players.retain(self.server_info.keys())
+        try:
+            await self.stats.flush(prune=self.is_leader())
+        except Exception as e:
+            log.error(f"Ошибка сохранения статистики: {e}")
 
     @tasks.loop(minutes=2)
     async def update_status(self):
+        # Статус бота - общая задача всех процессов: его собирает лидер, остальные берут готовый
+        lease = getattr(self.bot, "lease", None)
+        try:
+            if lease is None or lease.is_leader:
+                text = await self.presence_text()
+                if lease is not None:
+                    await lease.publish("minecraft_presence", text)
+            else:
+                text = await lease.read("minecraft_presence")
+        except Exception as e:
+            # Общая база может быть занята другим процессом ("database is locked"):
+            # статус остаётся прежним до следующей итерации
+            log.warning(f"Не удалось обновить статус бота: {e}")
+            return
+
+        # Статус отправляется в гейтвей каждого шарда, поэтому без изменений он не переотправляется
+        if text == self.presence:
+            return
+        self.presence = text
+        activity = discord.Activity(name=text, type=discord.ActivityType.watching) if text else None
+        await self.bot.change_presence(activity=activity)
+
+    async def presence_text(self) -> Optional[str]:
+        servers = self.server_info
+        if not owns_all_shards(self.bot):
+            # Серверы других процессов - по последнему записанному ими статусу
+            servers = {**await self.storage.load_all(), **self.server_info}
         servers_in_status = [
-            server for server in self.server_info.values() 
+            (channel_id, server) for channel_id, server in servers.items()
             if server.get("show_in_status", False)
         ]
         
         if not servers_in_status:
-            await self.bot.change_presence(activity=None)
-            return
+            return None
 
+        # Статус бота один на все серверы Discord, поэтому он на языке по умолчанию
+        tr = i18n.get("Minecraft")
         status_messages = []
-        for server in servers_in_status:
+        for channel_id, server in servers_in_status:
             address = server["address"]
             if ":" in address:
                 host, port = address.split(":")
@@ -416,31 +1116,74 @@ class Minecraft(commands.Cog):
                     address = host
 
             if server.get("display_in_status", "players") == "players" and server["last_status"] == "online":
-                status = await self.get_server_status(server.get("type", "java"), server["address"])
+                if channel_id in self.server_info:
+                    status = await self.get_server_status(
+                        server.get("type", "java"), server["address"], max_age=presence_max_age
+                    )
+                else:
+                    status = {"online": True, "players": server.get("online_players", 0)}
                 if status["online"]:
                     status_messages.append(f"{address}: {status['players']}👥")
                 else:
-                    status_messages.append(f"{address}: оффлайн")
+                    status_messages.append(f"{address}: {tr('presence.offline')}")
             else:
                 status_messages.append(address)
 
-        activity = discord.Activity(
-            name=" | ".join(status_messages),
-            type=discord.ActivityType.watching
-        )
-        await self.bot.change_presence(activity=activity)
+        return " | ".join(status_messages)
 
     @update_embed.before_loop
     async def before_update_embed(self):
         await self.bot.wait_until_ready()
 
+    def queue_player_events(self, server_data: dict, joined: List[str], left: List[Tuple[str, float]]):
+        """События копятся и отправляются одним сообщением на канал раз в player_events_interval"""
+        lines = self.player_events.setdefault(server_data["events_channel"], [])
+        events_channel = self.bot.get_channel(server_data["events_channel"])
+        tr = i18n.for_guild("Minecraft", getattr(events_channel, "guild", None))
+        timestamp = int(time.time())
+        for name in joined:
+            lines.append(tr("events.joined", timestamp, discord.utils.escape_markdown(name), server_data["address"]))
+        for name, session in left:
+            lines.append(tr(
+                "events.left", timestamp, discord.utils.escape_markdown(name), server_data["address"], duration(tr, session)
+            ))
+
+    @tasks.loop(seconds=player_events_interval)
+    async def post_player_events(self):
+        events, self.player_events = self.player_events, {}
+        for channel_id, lines in events.items():
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                continue
+
+            # Описание embed ограничено 4096 символами, в сообщении - до 10 embed
+            embeds = []
+            description = ""
+            for line in lines:
+                if len(description) + len(line) + 1 > 4000:
+                    embeds.append(discord.Embed(description=description, color=discord.Color.blue()))
+                    description = ""
+                description += line + "\n"
+            embeds.append(discord.Embed(description=description, color=discord.Color.blue()))
+
+            for start in range(0, len(embeds), 10):
+                try:
+                    await channel.send(embeds=embeds[start:start + 10])
+                except discord.HTTPException as e:
+                    log.warning(f"Ошибка отправки событий игроков: {e}", extra={"channel_id": channel.id})
+
     @update_status.before_loop
     async def before_update_status(self):
         await self.bot.wait_until_ready()
 
+    @post_player_events.before_loop
+    async def before_post_player_events(self):
+        await self.bot.wait_until_ready()
+
 class ServerSelectDropdown(discord.ui.Select):
-    def __init__(self, cog, server_info):
+    def __init__(self, cog, server_info, tr: Translator):
         self.cog = cog
+        self.tr = tr
         options = []
         for channel_id, server_data in server_info.items():
             server_type = server_data.get("type", "java").upper()
@@ -448,12 +1191,12 @@ class ServerSelectDropdown(discord.ui.Select):
                 discord.SelectOption(
                     label=f"{server_type} - {server_data['address']}",
                     value=str(channel_id),
-                    description=f"Канал ID: {channel_id}"
+                    description=tr("action.option_description", channel_id)
                 )
             )
         
         super().__init__(
-            placeholder="Выберите сервер...",
+            placeholder=tr("action.placeholder"),
             min_values=1,
             max_values=1,
             options=options
@@ -463,43 +1206,44 @@ class ServerSelectDropdown(discord.ui.Select):
         channel_id = int(self.values[0])
         server_data = self.cog.server_info[channel_id]
         
-        modal = ServerSettingsModal(self.cog, server_data, channel_id)
+        modal = ServerSettingsModal(self.cog, server_data, channel_id, self.tr)
         await interaction.response.send_modal(modal)
 
 class ServerSettingsModal(discord.ui.Modal):
-    def __init__(self, cog, server_data, channel_id):
-        super().__init__(title="Настройки сервера")
+    def __init__(self, cog, server_data, channel_id, tr: Translator):
+        super().__init__(title=tr("settings.title"))
         self.cog = cog
+        self.tr = tr
         self.server_data = server_data
         self.channel_id = channel_id
         
         self.add_item(discord.ui.TextInput(
-            label="Адрес сервера (host:port)",
+            label=tr("settings.address"),
             default=server_data["address"],
             required=True
         ))
         
         self.add_item(discord.ui.TextInput(
-            label="Тип сервера (java/bedrock)",
+            label=tr("settings.type"),
             default=server_data.get("type", "java"),
             required=True
         ))
         
         self.add_item(discord.ui.TextInput(
-            label="Порт RCON (оставьте пустым для отключения)",
+            label=tr("settings.rcon_port"),
             default=str(server_data.get("rcon", {}).get("port", "")),
             required=False
         ))
         
         self.add_item(discord.ui.TextInput(
-            label="Пароль RCON",
+            label=tr("settings.rcon_password"),
             default=server_data.get("rcon", {}).get("password", ""),
             required=False,
             style=discord.TextStyle.short
         ))
         
         self.add_item(discord.ui.TextInput(
-            label="ID канала для логов RCON",
+            label=tr("settings.rcon_log_channel"),
             default=str(server_data.get("rcon", {}).get("log_channel", "")),
             required=False
         ))
@@ -512,6 +1256,7 @@ class ServerSettingsModal(discord.ui.Modal):
         rcon_password = self.children[3].value.strip()
         rcon_log_channel = self.children[4].value.strip()
         
+        pipelining = self.server_data.get("rcon", {}).get("pipelining")
         if rcon_port and rcon_password:
             self.server_data["rcon"] = {
                 "enabled": True,
@@ -522,45 +1267,65 @@ class ServerSettingsModal(discord.ui.Modal):
                 self.server_data["rcon"]["log_channel"] = int(rcon_log_channel)
         else:
             self.server_data["rcon"] = {"enabled": False}
+        # Режим RCON задаётся командой /rcon_mode и в форме не меняется
+        if pipelining is not None:
+            self.server_data["rcon"]["pipelining"] = pipelining
         
         self.cog.server_info[self.channel_id] = self.server_data
-        self.cog.save_data()
+        self.cog.save_server(self.channel_id)
+        self.cog.scheduler.reset(self.channel_id)
         
         embed = discord.Embed(
-            title="Настройки обновлены",
-            description="Настройки сервера успешно сохранены.",
+            title=self.tr("settings.saved_title"),
+            description=self.tr("settings.saved_description"),
             color=discord.Color.green()
         )
         await interaction.response.send_message(embed=embed, ephemeral=True)
         
         channel = interaction.guild.get_channel(self.channel_id)
         if channel:
-            await self.cog.update_server_embed(channel)
+            if await self.cog.update_server_embed(channel):
+                self.cog.save_server(self.channel_id)
+
+class BulkCommandModal(discord.ui.Modal):
+    def __init__(self, cog, tr: Translator):
+        super().__init__(title=tr("bulk.modal_title"))
+        self.cog = cog
+
+        self.add_item(discord.ui.TextInput(
+            label=tr("bulk.modal_label"),
+            style=discord.TextStyle.paragraph,
+            max_length=4000,
+            required=True
+        ))
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await self.cog.run_bulk_commands(interaction, self.children[0].value)
 
 class ServerSettingsView(discord.ui.View):
-    def __init__(self, cog, server_data, channel_id):
+    def __init__(self, cog, server_data, channel_id, tr: Translator):
         super().__init__()
         self.cog = cog
         self.server_data = server_data
         self.channel_id = channel_id
         
         self.add_item(discord.ui.Button(
-            label="Игроки/IP в статусе",
+            label=tr("settings.status_display"),
             style=discord.ButtonStyle.primary,
             custom_id="status_display"
         ))
         self.add_item(discord.ui.Button(
-            label="Показывать в статусе бота",
+            label=tr("settings.show_in_status"),
             style=discord.ButtonStyle.secondary,
             custom_id="show_in_status"
         ))
         self.add_item(discord.ui.Button(
-            label="Переименовывать канал",
+            label=tr("settings.rename_channel"),
             style=discord.ButtonStyle.secondary,
             custom_id="rename_channel"
         ))
         self.add_item(discord.ui.Button(
-            label="Удалить сервер",
+            label=tr("settings.delete_server"),
             style=discord.ButtonStyle.danger,
             custom_id="delete_server"
         ))
@@ -568,7 +1333,7 @@ class ServerSettingsView(discord.ui.View):
     async def interaction_check(self, interaction: discord.Interaction):
         if not any(role.id in allowed_role_ids for role in interaction.user.roles):
             await interaction.response.send_message(
-                "У вас недостаточно прав для этого действия.",
+                i18n.for_interaction("Minecraft", interaction)("error.no_permission_action"),
                 ephemeral=True
             )
             return False
@@ -0,0 +1,94 @@
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class PlayerTracker:
+    """Индекс игровых сессий, построенный по разнице выборок игроков из статуса.
+
+    Для каждого сервера хранит, кто сейчас онлайн и с какого времени, и
+    суммарное время игры по закрытым сессиям. Сессии закрываются, только
+    если сервер не ответил offline_samples опросов подряд: один потерянный
+    пакет не должен выкидывать и заново впускать всех игроков.
+    """
+
+    def __init__(self, offline_samples: int = 2):
+        self.offline_samples = max(1, offline_samples)
+        self._online: Dict[int, Dict[str, float]] = {}
+        self._playtime: Dict[int, Dict[str, float]] = {}
+        self._offline: Dict[int, int] = {}
+
+    def update(self, channel_id: int, status: dict,
+               now: Optional[float] = None) -> Tuple[List[str], List[Tuple[str, float]]]:
+        """Сравнение новой выборки с прошлой: (зашедшие, [(вышедший, длина сессии)])"""
+        now = time.time() if now is None else now
+
+        if status["online"]:
+            self._offline.pop(channel_id, None)
+            names = status.get("player_list") or []
+            # Сервер отдаёт не больше 12 игроков в выборке: по неполной выборке
+            # нельзя понять, кто вышел, поэтому сессии закрываются без событий,
+            # а следующая полная выборка снова станет первой
+            if len(names) != status.get("players", 0):
+                self.reset(channel_id, now)
+                return [], []
+            current = set(names)
+        else:
+            misses = self._offline.get(channel_id, 0) + 1
+            self._offline[channel_id] = misses
+            if misses < self.offline_samples:
+                return [], []
+            current = set()
+
+        previous = self._online.get(channel_id)
+        if previous is None:
+            # Первая выборка после запуска только запоминается, иначе все игроки "зайдут" разом
+            self._online[channel_id] = {name: now for name in current}
+            return [], []
+
+        joined = sorted(current - previous.keys())
+        left = []
+        playtime = self._playtime.setdefault(channel_id, {})
+        for name in sorted(previous.keys() - current):
+            session = now - previous.pop(name)
+            playtime[name] = playtime.get(name, 0.0) + session
+            left.append((name, session))
+        for name in joined:
+            previous[name] = now
+        return joined, left
+
+    def reset(self, channel_id: int, now: Optional[float] = None) -> None:
+        """Сброс выборки сервера: время открытых сессий учитывается, события не создаются"""
+        now = time.time() if now is None else now
+        previous = self._online.pop(channel_id, None)
+        if not previous:
+            return
+        playtime = self._playtime.setdefault(channel_id, {})
+        for name, since in previous.items():
+            playtime[name] = playtime.get(name, 0.0) + now - since
+
+    def online(self, channel_id: int) -> List[Tuple[str, float]]:
+        """Игроки онлайн и время начала их сессий, раньше зашедшие - первыми"""
+        return sorted(self._online.get(channel_id, {}).items(), key=lambda item: item[1])
+
+    def top(self, channel_id: int, limit: int = 10, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Игроки с наибольшим временем игры, включая текущие сессии"""
+        now = time.time() if now is None else now
+        totals = dict(self._playtime.get(channel_id, {}))
+        for name, since in self._online.get(channel_id, {}).items():
+            totals[name] = totals.get(name, 0.0) + now - since
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def retain(self, channel_ids: Iterable[int]) -> None:
+        channel_ids = set(channel_ids)
+        for state in (self._online, self._playtime, self._offline):
+            for channel_id in list(state):
+                if channel_id not in channel_ids:
+                    del state[channel_id]
+
+
+def format_duration(seconds: float, hours_format: str = "{0}ч {1}м", minutes_format: str = "{0}м") -> str:
+    minutes = int(seconds // 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return hours_format.format(hours, minutes)
+    return minutes_format.format(minutes)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+from mcstatus import BedrockServer
+from mcstatus.address import Address
+from mcstatus.pinger import AsyncServerPinger
+from mcstatus.protocol.connection import TCPAsyncSocketConnection
+
+from Modules.Minecraft.resolver import AddressResolver
+from Modules.Tools.metrics import metrics
+
+
+class StatusPoller:
+    """Параллельный опрос Minecraft-серверов через асинхронное API mcstatus"""
+
+    def __init__(self, concurrency: int = 64, timeout: float = 5.0, resolver: Optional[AddressResolver] = None):
+        self.timeout = timeout
+        self.resolver = resolver or AddressResolver(timeout=timeout)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(self, server_type: str, address: str) -> dict:
+        """Опрос одного сервера с ограничением по времени"""
+        async with self._semaphore:
+            with metrics.timer("minecraft_probe", server_type):
+                try:
+                    return await asyncio.wait_for(
+                        self._probe(server_type, address),
+                        timeout=self.timeout
+                    )
+                except Exception:
+                    metrics.inc("minecraft_probe_failed", server_type)
+                    return {"online": False}
+
+    async def _probe(self, server_type: str, address: str) -> dict:
+        if server_type not in ("java", "bedrock"):
+            return {"online": False}
+
+        # Адрес берётся из кэша DNS, сервер опрашивается сразу по IP
+        resolved = await self.resolver.resolve(server_type, address)
+
+        if server_type == "java":
+            async with TCPAsyncSocketConnection(Address(resolved.ip, resolved.port), self.timeout) as connection:
+                # В рукопожатии передаётся имя хоста: по нему прокси выбирают сервер
+                pinger = AsyncServerPinger(connection, address=Address(resolved.host, resolved.port))
+                pinger.handshake()
+                status = await pinger.read_status()
+            return {
+                "online": True,
+                "players": status.players.online,
+                "max_players": status.players.max,
+                "player_list": [player.name for player in status.players.sample] if status.players.sample else [],
+                "version": status.version.name,
+                "latency": status.latency
+            }
+        else:
+            server = BedrockServer(resolved.ip, resolved.port, timeout=self.timeout)
+            status = await server.async_status()
+            return {
+                "online": True,
+                "players": status.players_online,
+                "max_players": status.players_max,
+                "player_list": [],
+                "version": status.version.version,
+                "latency": status.latency
+            }
@@ -0,0 +1,139 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import dns.asyncresolver
+import dns.resolver
+from dns.rdatatype import RdataType
+
+Key = Tuple[str, str]
+
+
+class Resolved(NamedTuple):
+    host: str  # Имя для рукопожатия (цель SRV или исходный хост)
+    ip: str
+    port: int
+
+
+class Entry:
+    __slots__ = ("result", "error", "expires", "refresh_at")
+
+    def __init__(self, result: Optional[Resolved], error: Optional[Exception], ttl: float, refresh_ahead: float):
+        now = time.monotonic()
+        self.result = result
+        self.error = error
+        self.expires = now + ttl
+        self.refresh_at = now + ttl * (1 - refresh_ahead)
+
+
+class AddressResolver:
+    """Кэш DNS (SRV + A) для адресов серверов.
+
+    Учитывает TTL записей, ненадолго кэширует ошибки, обновляет запись в
+    фоне незадолго до истечения и при сбое резолвера отдаёт последний
+    известный адрес.
+    """
+
+    def __init__(self, timeout: float = 3.0, min_ttl: float = 30.0, max_ttl: float = 3600.0,
+                 negative_ttl: float = 30.0, refresh_ahead: float = 0.2):
+        self.timeout = timeout
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_ahead = refresh_ahead
+        self._entries: Dict[Key, Entry] = {}
+        self._inflight: Dict[Key, asyncio.Future] = {}
+
+    async def resolve(self, server_type: str, address: str) -> Resolved:
+        key = (server_type, address)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None and now < entry.expires:
+            if entry.error is not None:
+                raise entry.error
+            if now >= entry.refresh_at:
+                self._refresh(key)
+            return entry.result
+
+        try:
+            return await asyncio.shield(self._refresh(key))
+        except Exception:
+            # Резолвер недоступен: лучше устаревший адрес, чем никакого
+            if entry is not None and entry.result is not None:
+                return entry.result
+            raise
+
+    def retain(self, keys) -> None:
+        keys = set(keys)
+        for key in list(self._entries):
+            if key not in keys:
+                del self._entries[key]
+
+    def _refresh(self, key: Key) -> asyncio.Future:
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._lookup(key))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Исключение фонового обновления забирается здесь, чтобы не было предупреждения
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return task
+
+    async def _lookup(self, key: Key) -> Resolved:
+        server_type, address = key
+        host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+        port = int(port) if port else None
+
+        try:
+            if server_type == "java" and port is None and not is_ip(host):
+                # Как клиент Minecraft: SRV ищется только если порт не указан
+                try:
+                    target, port, srv_ttl = await self._srv(host)
+                    host = target
+                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                    srv_ttl = self.max_ttl
+            else:
+                srv_ttl = self.max_ttl
+
+            if port is None:
+                port = 25565 if server_type == "java" else 19132
+            ip, a_ttl = await self._address(host)
+        except Exception as e:
+            previous = self._entries.get(key)
+            if previous is not None and previous.result is not None:
+                # Устаревший адрес продолжает использоваться, повтор - через negative_ttl
+                self._entries[key] = Entry(previous.result, None, self.negative_ttl, 0)
+            else:
+                self._entries[key] = Entry(None, e, self.negative_ttl, self.refresh_ahead)
+            raise
+
+        ttl = max(self.min_ttl, min(self.max_ttl, srv_ttl, a_ttl))
+        result = Resolved(host, ip, port)
+        self._entries[key] = Entry(result, None, ttl, self.refresh_ahead)
+        return result
+
+    async def _srv(self, host: str) -> Tuple[str, int, float]:
+        answers = await dns.asyncresolver.resolve(f"_minecraft._tcp.{host}", RdataType.SRV, lifetime=self.timeout)
+        answer = answers[0]
+        return str(answer.target).rstrip("."), int(answer.port), answers.rrset.ttl
+
+    async def _address(self, host: str) -> Tuple[str, float]:
+        if is_ip(host):
+            return host, self.max_ttl
+        try:
+            answers = await dns.asyncresolver.resolve(host, RdataType.A, lifetime=self.timeout)
+            return str(answers[0]).rstrip("."), answers.rrset.ttl
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+            # Имена из /etc/hosts и IPv6-only хосты - через системный резолвер
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            return infos[0][4][0], self.min_ttl
+
+
+def is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
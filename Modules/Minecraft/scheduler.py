@@ -0,0 +1,79 @@
+import random
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class PollScheduler:
+    """Расписание опроса серверов: у каждого сервера своё время следующего опроса.
+
+    Оффлайн-серверы опрашиваются всё реже (экспоненциальная задержка),
+    серверы, у которых меняется число игроков или статус, - чаще. Первые
+    опросы распределяются по интервалу, чтобы не опрашивать всё разом.
+    """
+
+    def __init__(self, base_interval: float = 60.0, min_interval: float = 20.0,
+                 max_interval: float = 1800.0, jitter: float = 0.1):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self._due: Dict[int, float] = {}
+        self._failures: Dict[int, int] = {}
+        self._last: Dict[int, tuple] = {}
+
+    def due(self, channel_ids: Iterable[int], now: Optional[float] = None) -> List[int]:
+        """Серверы, которые пора опросить"""
+        now = time.monotonic() if now is None else now
+        result = []
+        for channel_id in channel_ids:
+            due = self._due.get(channel_id)
+            if due is None:
+                # Мультипликативный хэш Кнута равномерно раскладывает новые серверы по интервалу.
+                # Считается в целых числах: snowflake больше 2^53, в float дробная часть теряется
+                due = self._due[channel_id] = now + spread(channel_id) * self.base_interval
+            if due <= now:
+                result.append(channel_id)
+        return result
+
+    def report(self, channel_id: int, status: dict, interval: Optional[float] = None) -> float:
+        """Учёт результата опроса и выбор времени следующего; возвращает интервал"""
+        base = interval or self.base_interval
+        current = (status["online"], status.get("players"))
+        previous = self._last.get(channel_id)
+        self._last[channel_id] = current
+
+        if not status["online"]:
+            failures = self._failures.get(channel_id, 0) + 1
+            self._failures[channel_id] = failures
+            delay = min(self.max_interval, base * 2 ** (failures - 1))
+        else:
+            self._failures.pop(channel_id, None)
+            if previous is not None and previous != current:
+                # Изменилось число игроков или сервер только что поднялся
+                delay = max(self.min_interval, base / 3)
+            else:
+                delay = base
+        # Заданный для сервера интервал не нарушается ускорением
+        if interval:
+            delay = max(delay, interval)
+
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._due[channel_id] = time.monotonic() + delay
+        return delay
+
+    def reset(self, channel_id: int) -> None:
+        """Немедленный опрос сервера при следующем проходе (например, после смены настроек)"""
+        self._due[channel_id] = 0.0
+        self._failures.pop(channel_id, None)
+
+    def retain(self, channel_ids: Iterable[int]) -> None:
+        channel_ids = set(channel_ids)
+        for state in (self._due, self._failures, self._last):
+            for channel_id in list(state):
+                if channel_id not in channel_ids:
+                    del state[channel_id]
+
+
+def spread(channel_id: int) -> float:
+    """Доля интервала [0, 1) для сервера, постоянная для одного канала"""
+    return (channel_id * 2654435761 % 2 ** 32) / 2 ** 32
@@ -0,0 +1,267 @@
+import math
+import os
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from Modules.Tools.metrics import metrics
+
+Key = Tuple[str, str]
+# Точка графика: (время, игроки в среднем, игроки максимум, пинг в среднем или nan, доля времени онлайн)
+Point = Tuple[float, float, int, float, float]
+
+# Размер корзины агрегации в секундах и сколько секунд хранить корзины на диске
+ROLLUPS = {
+    60: 2 * 86400,
+    3600: 90 * 86400,
+    86400: 730 * 86400,
+}
+
+
+class RingBuffer:
+    """Последние сырые замеры сервера в массивах фиксированного размера"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', [0.0] * capacity)
+        self.players = array('H', [0] * capacity)
+        self.latency = array('f', [math.nan] * capacity)
+        self.size = 0
+        self._next = 0
+
+    def append(self, timestamp: float, players: int, latency: float) -> None:
+        self.timestamps[self._next] = timestamp
+        self.players[self._next] = min(players, 0xFFFF)
+        self.latency[self._next] = latency
+        self._next = (self._next + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    @property
+    def oldest(self) -> Optional[float]:
+        if not self.size:
+            return None
+        return self.timestamps[(self._next - self.size) % self.capacity]
+
+    def since(self, start: float) -> List[Point]:
+        """Замеры не старше start в хронологическом порядке"""
+        points = []
+        for offset in range(self.size):
+            index = (self._next - self.size + offset) % self.capacity
+            if self.timestamps[index] < start:
+                continue
+            latency = self.latency[index]
+            online = 0.0 if math.isnan(latency) else 1.0
+            points.append((self.timestamps[index], float(self.players[index]), self.players[index], latency, online))
+        return points
+
+
+class Bucket:
+    """Незакрытая корзина агрегации"""
+    __slots__ = ("start", "samples", "online", "players_sum", "players_max", "latency_sum",
+                 "seconds", "online_seconds")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.samples = 0
+        self.online = 0
+        self.players_sum = 0
+        self.players_max = 0
+        self.latency_sum = 0.0
+        self.seconds = 0.0
+        self.online_seconds = 0.0
+
+    def add(self, players: int, latency: float) -> None:
+        self.samples += 1
+        if not math.isnan(latency):
+            self.online += 1
+            self.players_sum += players
+            self.players_max = max(self.players_max, players)
+            self.latency_sum += latency
+
+    def add_time(self, seconds: float, online: bool) -> None:
+        self.seconds += seconds
+        if online:
+            self.online_seconds += seconds
+
+    def row(self) -> tuple:
+        return (self.start, self.samples, self.online, self.players_sum, self.players_max, self.latency_sum,
+                self.seconds, self.online_seconds)
+
+
+def bucket_point(start: float, samples: int, online: int, players_sum: int, players_max: int,
+                 latency_sum: float, seconds: float = 0.0, online_seconds: float = 0.0) -> Point:
+    # Недоступные серверы опрашиваются реже, поэтому доля времени онлайн считается
+    # по времени, а не по числу замеров (корзины из старых баз времени не содержат)
+    uptime = online_seconds / seconds if seconds else online / samples if samples else 0.0
+    if not online:
+        return start, 0.0, 0, math.nan, uptime
+    return start, players_sum / online, players_max, latency_sum / online, uptime
+
+
+def uptime(points: List[Point], max_gap: float = 3600.0) -> float:
+    """Доля времени онлайн: каждая точка весит время до следующей (не больше max_gap),
+    последняя - столько же, сколько предыдущая"""
+    if not points:
+        return 0.0
+    weights = [min(after[0] - before[0], max_gap) for before, after in zip(points, points[1:])]
+    weights.append(weights[-1] if weights else 1.0)
+    total = sum(weights)
+    if not total:
+        return sum(point[4] for point in points) / len(points)
+    return sum(weight * point[4] for weight, point in zip(weights, points)) / total
+
+
+class StatsStore:
+    """История игроков и пинга серверов.
+
+    В памяти хранятся только кольцевые буферы сырых замеров и открытые
+    корзины агрегации (1 мин / 1 ч / 1 день), поэтому расход памяти не
+    зависит от срока хранения. Закрытые корзины записываются в SQLite.
+
+    Каждый замер считается верным до следующего: время между ними (не больше
+    max_gap, чтобы не учитывать простой самого бота) добавляется в корзины
+    как время онлайн или офлайн.
+    """
+
+    def __init__(self, path: str, raw_capacity: int = 240, max_gap: float = 3600.0):
+        self.path = path
+        self.raw_capacity = raw_capacity
+        self.max_gap = max_gap
+        self._db: Optional[aiosqlite.Connection] = None
+        self._raw: Dict[Key, RingBuffer] = {}
+        self._open: Dict[Key, Dict[int, Bucket]] = {}
+        self._last: Dict[Key, Tuple[float, bool]] = {}
+        self._closed: List[tuple] = []
+        self._last_prune = 0.0
+
+    async def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS stats ("
+            "server TEXT NOT NULL, resolution INTEGER NOT NULL, ts INTEGER NOT NULL, "
+            "samples INTEGER NOT NULL, online INTEGER NOT NULL, players_sum INTEGER NOT NULL, "
+            "players_max INTEGER NOT NULL, latency_sum REAL NOT NULL, "
+            "seconds REAL NOT NULL DEFAULT 0, online_seconds REAL NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (server, resolution, ts))"
+        )
+        columns = {row[1] for row in await self._db.execute_fetchall("PRAGMA table_info(stats)")}
+        for column in ("seconds", "online_seconds"):
+            if column not in columns:
+                await self._db.execute(f"ALTER TABLE stats ADD COLUMN {column} REAL NOT NULL DEFAULT 0")
+        await self._db.commit()
+
+    def record(self, key: Key, status: dict, timestamp: Optional[float] = None) -> None:
+        """Учёт одного опроса сервера"""
+        timestamp = time.time() if timestamp is None else timestamp
+        players = status.get("players", 0) if status["online"] else 0
+        latency = float(status["latency"]) if status["online"] else math.nan
+
+        if key not in self._raw:
+            self._raw[key] = RingBuffer(self.raw_capacity)
+        self._raw[key].append(timestamp, players, latency)
+
+        last = self._last.get(key)
+        self._last[key] = (timestamp, status["online"])
+        gap = min(max(timestamp - last[0], 0.0), self.max_gap) if last is not None else 0.0
+
+        buckets = self._open.setdefault(key, {})
+        for resolution in ROLLUPS:
+            start = int(timestamp) // resolution * resolution
+            bucket = buckets.get(resolution)
+            if bucket is not None and bucket.start != start:
+                self._closed.append((server_id(key), resolution) + bucket.row())
+                bucket = None
+            if bucket is None:
+                bucket = buckets[resolution] = Bucket(start)
+            bucket.add(players, latency)
+            if gap:
+                bucket.add_time(gap, last[1])
+
+    def retain(self, keys) -> None:
+        """Освобождение памяти серверов, которые больше не отслеживаются"""
+        keys = set(keys)
+        for key in list(self._raw):
+            if key not in keys:
+                del self._raw[key]
+                self._last.pop(key, None)
+                for resolution, bucket in self._open.pop(key, {}).items():
+                    self._closed.append((server_id(key), resolution) + bucket.row())
+
+    async def flush(self, prune: bool = True) -> None:
+        """Запись закрытых корзин и удаление устаревших (prune=False - без удаления,
+        если чисткой общей базы занимается другой процесс)"""
+        if self._db is None:
+            return
+        now = time.time()
+        prune = prune and now - self._last_prune > 3600
+        if not self._closed and not prune:
+            return
+
+        with metrics.timer("storage_write", "stats"):
+            closed, self._closed = self._closed, []
+            try:
+                if closed:
+                    await self._db.executemany(
+                        "INSERT INTO stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(server, resolution, ts) DO UPDATE SET "
+                        "samples = samples + excluded.samples, online = online + excluded.online, "
+                        "players_sum = players_sum + excluded.players_sum, "
+                        "players_max = MAX(players_max, excluded.players_max), "
+                        "latency_sum = latency_sum + excluded.latency_sum, "
+                        "seconds = seconds + excluded.seconds, online_seconds = online_seconds + excluded.online_seconds",
+                        closed
+                    )
+
+                if prune:
+                    await self._db.executemany(
+                        "DELETE FROM stats WHERE resolution = ? AND ts < ?",
+                        [(resolution, int(now - retention)) for resolution, retention in ROLLUPS.items()]
+                    )
+                await self._db.commit()
+            except Exception:
+                # Незаписанные корзины возвращаются в очередь перед закрытыми за это время
+                await self._db.rollback()
+                self._closed[:0] = closed
+                raise
+            if prune:
+                self._last_prune = now
+
+    async def close(self) -> None:
+        # Незакрытые корзины тоже сохраняются, при следующем запуске они дополнятся
+        for key, buckets in self._open.items():
+            for resolution, bucket in buckets.items():
+                self._closed.append((server_id(key), resolution) + bucket.row())
+        self._open.clear()
+        await self.flush(prune=False)
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def series(self, key: Key, window: float) -> List[Point]:
+        """Точки графика за последние window секунд"""
+        start = time.time() - window
+        raw = self._raw.get(key)
+        if raw is not None and raw.oldest is not None and raw.oldest <= start:
+            return raw.since(start)
+
+        resolution = 60 if window <= 2 * 86400 else 3600 if window <= 90 * 86400 else 86400
+        rows = []
+        if self._db is not None:
+            rows = await self._db.execute_fetchall(
+                "SELECT ts, samples, online, players_sum, players_max, latency_sum, seconds, online_seconds FROM stats "
+                "WHERE server = ? AND resolution = ? AND ts >= ? ORDER BY ts",
+                (server_id(key), resolution, int(start))
+            )
+        points = [bucket_point(*row) for row in rows]
+        bucket = self._open.get(key, {}).get(resolution)
+        if bucket is not None and bucket.samples:
+            points.append(bucket_point(*bucket.row()))
+        return points
+
+
+def server_id(key: Key) -> str:
+    return f"{key[0]}/{key[1]}"
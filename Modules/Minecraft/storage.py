@@ -0,0 +1,139 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import aiosqlite
+
+from Modules.Tools.metrics import metrics
+
+log = logging.getLogger(__name__)
+
+
+class ServerStorage:
+    """Хранилище отслеживаемых серверов в SQLite.
+
+    Каждый сервер - одна строка таблицы, изменения копятся и записываются
+    одной транзакцией через flush_delay секунд. aiosqlite выполняет запросы
+    в отдельном потоке, поэтому диск не блокирует цикл событий.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None, flush_delay: float = 2.0):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.flush_delay = flush_delay
+        self._db: Optional[aiosqlite.Connection] = None
+        self._dirty: Dict[int, dict] = {}
+        self._deleted = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    async def open(self) -> Dict[int, dict]:
+        """Открытие базы и загрузка всех серверов"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS servers (channel_id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        await self._db.commit()
+        await self._migrate()
+        return await self.load_all()
+
+    async def load_all(self) -> Dict[int, dict]:
+        """Все серверы из базы, включая записанные другими процессами бота"""
+        rows = await self._db.execute_fetchall("SELECT channel_id, data FROM servers")
+        return {channel_id: json.loads(data) for channel_id, data in rows}
+
+    def save(self, channel_id: int, data: dict) -> None:
+        """Отложенная запись одного сервера"""
+        self._deleted.discard(channel_id)
+        self._dirty[channel_id] = data
+        self._schedule()
+
+    def delete(self, channel_id: int) -> None:
+        """Отложенное удаление одного сервера"""
+        self._dirty.pop(channel_id, None)
+        self._deleted.add(channel_id)
+        self._schedule()
+
+    async def flush(self) -> None:
+        """Запись всех накопленных изменений одной транзакцией"""
+        async with self._flush_lock:
+            if self._db is None or not (self._dirty or self._deleted):
+                return
+            dirty, self._dirty = self._dirty, {}
+            deleted, self._deleted = self._deleted, set()
+
+            with metrics.timer("storage_write", "servers"):
+                try:
+                    await self._db.executemany(
+                        "INSERT INTO servers (channel_id, data) VALUES (?, ?) "
+                        "ON CONFLICT(channel_id) DO UPDATE SET data = excluded.data",
+                        [(channel_id, json.dumps(data)) for channel_id, data in dirty.items()]
+                    )
+                    await self._db.executemany(
+                        "DELETE FROM servers WHERE channel_id = ?",
+                        [(channel_id,) for channel_id in deleted]
+                    )
+                    await self._db.commit()
+                except Exception:
+                    # Несохранённые изменения возвращаются в очередь, если их не перекрыли новые
+                    await self._db.rollback()
+                    for channel_id, data in dirty.items():
+                        if channel_id not in self._deleted:
+                            self._dirty.setdefault(channel_id, data)
+                    self._deleted |= {channel_id for channel_id in deleted if channel_id not in self._dirty}
+                    raise
+
+    async def close(self) -> None:
+        """Запись оставшихся изменений и закрытие базы"""
+        await self.flush()
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    def _schedule(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            log.error(f"Ошибка сохранения серверов: {e}")
+
+    async def _migrate(self) -> None:
+        """Однократный перенос серверов из старого data.json"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        # Проверка и перенос - одна транзакция: несколько процессов бота могут
+        # запуститься одновременно, и пустую таблицу должен заполнить только один
+        await self._db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = await self._db.execute_fetchall("SELECT COUNT(*) FROM servers")
+            if rows[0][0]:
+                await self._db.rollback()
+                return
+            with open(self.legacy_path, 'r') as f:
+                data = json.load(f)
+            await self._db.executemany(
+                "INSERT OR IGNORE INTO servers (channel_id, data) VALUES (?, ?)",
+                [(int(channel_id), json.dumps(server_data)) for channel_id, server_data in data.items()]
+            )
+            await self._db.commit()
+        except FileNotFoundError:
+            # Файл уже перенёс другой процесс
+            await self._db.rollback()
+            return
+        except Exception:
+            await self._db.rollback()
+            raise
+        try:
+            os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,192 @@
+import asyncio
+import bisect
+import difflib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from Modules.Tools.http_client import HTTPClient
+
+CATALOG_URL = "https://emoji.gg/api/"
+# Из каталога хранятся только нужные поля, так файл кэша в разы меньше ответа API
+FIELDS = ("id", "title", "slug", "image", "category", "faves")
+
+
+class EmojiCatalog:
+    """Каталог emoji.gg с кэшем на диске и индексами по id и slug.
+
+    Каталог обновляется условным запросом (ETag / If-Modified-Since) не чаще
+    раза в ttl секунд; если emoji.gg недоступен, используется кэш с диска.
+    """
+
+    def __init__(self, http: HTTPClient, path: str, ttl: float = 6 * 3600, max_body: int = 64 * 1024 * 1024):
+        self.http = http
+        self.path = path
+        self.ttl = ttl
+        self.max_body = max_body
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at = 0.0
+        self._by_id: Dict[str, dict] = {}
+        self._by_slug: Dict[str, dict] = {}
+        self._slugs: List[str] = []
+        # Все slug одной строкой: поиск вхождения через str.find вместо цикла по списку
+        self._haystack = ""
+        self._offsets: List[int] = []
+        self._lock: Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    async def load(self) -> None:
+        """Чтение кэша с диска (без сети)"""
+        if not os.path.exists(self.path):
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            cache = await loop.run_in_executor(None, self._read_cache)
+        except (OSError, ValueError):
+            return
+        self.etag = cache.get("etag")
+        self.last_modified = cache.get("last_modified")
+        self.fetched_at = cache.get("fetched_at", 0.0)
+        self._index(cache.get("emojis", []))
+
+    async def ensure_fresh(self) -> None:
+        """Обновление каталога, если он устарел; при ошибке остаётся прежний"""
+        if self._by_id and time.time() - self.fetched_at < self.ttl:
+            return
+        # Замок создаётся в работающем event loop: бот создаётся до запуска loop
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._by_id and time.time() - self.fetched_at < self.ttl:
+                return
+            try:
+                await self.refresh()
+            except Exception:
+                if not self._by_id:
+                    raise
+
+    async def refresh(self) -> bool:
+        """Условный запрос каталога; True, если каталог изменился"""
+        headers = {}
+        if self._by_id:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+
+        async with self.http.session.get(CATALOG_URL, headers=headers) as response:
+            if response.status == 304:
+                self.fetched_at = time.time()
+                await self._save()
+                return False
+            response.raise_for_status()
+            body = await self.http.read_limited(response, self.max_body)
+            self.etag = response.headers.get("ETag")
+            self.last_modified = response.headers.get("Last-Modified")
+
+        # Разбор многомегабайтного JSON - в отдельном потоке, чтобы не останавливать event loop
+        loop = asyncio.get_running_loop()
+        emojis = await loop.run_in_executor(None, parse_catalog, body)
+        self.fetched_at = time.time()
+        self._index(emojis)
+        await self._save()
+        return True
+
+    def get(self, key: str) -> Optional[dict]:
+        """Поиск по id, по "id-slug" (как в ссылках emoji.gg) или по slug"""
+        key = key.strip()
+        emoji = self._by_id.get(key) or self._by_slug.get(key.lower())
+        if emoji is None and "-" in key:
+            emoji = self._by_id.get(key.split("-", 1)[0])
+        return emoji
+
+    def search(self, query: str, limit: int = 25) -> List[dict]:
+        """Эмодзи для автодополнения: сначала по началу slug, затем по вхождению, затем похожие"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        if query.isdigit() and query in self._by_id:
+            return [self._by_id[query]]
+
+        results = []
+        seen = set()
+
+        def add(slug: str) -> bool:
+            if slug not in seen:
+                seen.add(slug)
+                results.append(self._by_slug[slug])
+            return len(results) >= limit
+
+        start = bisect.bisect_left(self._slugs, query)
+        for slug in self._slugs[start:]:
+            if not slug.startswith(query) or add(slug):
+                break
+        words = query.replace("-", " ").replace("_", " ").split()
+        if len(results) < limit and words:
+            longest = max(words, key=len)
+            position = self._haystack.find(longest)
+            while position != -1:
+                index = bisect.bisect_right(self._offsets, position) - 1
+                slug = self._slugs[index]
+                if all(word in slug for word in words) and add(slug):
+                    break
+                position = self._haystack.find(longest, self._offsets[index] + len(slug) + 1)
+        if not results:
+            # Опечатки: сравниваются только slug с теми же первыми двумя символами
+            prefix = query[:2]
+            start = bisect.bisect_left(self._slugs, prefix)
+            end = bisect.bisect_left(self._slugs, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+            for slug in difflib.get_close_matches(query, self._slugs[start:end], n=limit, cutoff=0.6):
+                add(slug)
+        return results
+
+    def _index(self, emojis: List[dict]) -> None:
+        self._by_id = {str(emoji["id"]): emoji for emoji in emojis}
+        # При совпадении slug остаётся самый популярный эмодзи
+        by_slug = {}
+        for emoji in sorted(emojis, key=lambda e: e.get("faves") or 0):
+            by_slug[emoji["slug"].lower()] = emoji
+        self._by_slug = by_slug
+        self._slugs = sorted(by_slug)
+        self._haystack = "\n".join(self._slugs)
+        self._offsets = []
+        offset = 0
+        for slug in self._slugs:
+            self._offsets.append(offset)
+            offset += len(slug) + 1
+
+    def _read_cache(self) -> dict:
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    async def _save(self) -> None:
+        cache = {
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+            "emojis": list(self._by_id.values())
+        }
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write_cache, cache)
+
+    def _write_cache(self, cache: dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Запись во временный файл и замена, чтобы оборванная запись не испортила кэш
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+def parse_catalog(body: bytes) -> List[dict]:
+    return [
+        {field: emoji.get(field) for field in FIELDS}
+        for emoji in json.loads(body)
+        if emoji.get("id") is not None and emoji.get("slug") and emoji.get("image")
+    ]
@@ -0,0 +1,223 @@
+import asyncio
+import io
+import os
+import re
+import zipfile
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import discord
+from PIL import Image, ImageSequence
+
+from Modules.Tools.emoji_catalog import EmojiCatalog
+from Modules.Tools.http_client import HTTPClient, ResponseTooLarge
+
+# Ограничение Discord на файл эмодзи
+EMOJI_MAX_BYTES = 256 * 1024
+# Эмодзи показываются не больше 128x128, крупнее хранить незачем
+EMOJI_SIZE = 128
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+
+class Source(NamedTuple):
+    name: str
+    url: Optional[str] = None
+    data: Optional[bytes] = None
+
+
+class ImportResult(NamedTuple):
+    name: str
+    emoji: Optional[discord.Emoji]
+    error: Optional[str]
+
+
+def emoji_name(name: str) -> str:
+    """Название, которое примет Discord: буквы, цифры и _, от 2 до 32 символов"""
+    name = re.sub(r"[^A-Za-z0-9_]", "_", name).strip("_")[:32]
+    return name if len(name) >= 2 else f"emoji_{name}"
+
+
+def shrink_image(data: bytes, limit: int = EMOJI_MAX_BYTES) -> Tuple[bytes, bool]:
+    """Уменьшение картинки до limit байт: размер, палитра, для GIF - пропуск кадров.
+
+    Возвращает (данные, анимирована ли картинка). Выполняется в отдельном потоке.
+    """
+    image = Image.open(io.BytesIO(data))
+    animated = getattr(image, "is_animated", False) and image.format == "GIF"
+    if len(data) <= limit and max(image.size) <= EMOJI_SIZE * 2:
+        return data, animated
+
+    if not animated:
+        image = image.convert("RGBA")
+        image.thumbnail((EMOJI_SIZE, EMOJI_SIZE), Image.LANCZOS)
+        for colors in (None, 256, 64, 16):
+            candidate = image if colors is None else image.quantize(colors, method=Image.FASTOCTREE)
+            output = io.BytesIO()
+            candidate.save(output, format="PNG", optimize=True)
+            if output.tell() <= limit:
+                return output.getvalue(), False
+        raise ValueError("не удалось уменьшить картинку до 256 КБ")
+
+    frames = []
+    durations = []
+    for frame in ImageSequence.Iterator(image):
+        durations.append(frame.info.get("duration", image.info.get("duration", 100)))
+        frame = frame.convert("RGBA")
+        frame.thumbnail((EMOJI_SIZE, EMOJI_SIZE), Image.LANCZOS)
+        frames.append(frame)
+
+    size = EMOJI_SIZE
+    step = 1
+    for colors in (256, 128, 64, 32):
+        while True:
+            # Пропущенные кадры отдают своё время соседним, скорость анимации не меняется
+            kept = frames[::step]
+            kept_durations = [sum(durations[i:i + step]) for i in range(0, len(frames), step)]
+            if size != EMOJI_SIZE:
+                kept = [frame.resize((max(1, frame.width * size // EMOJI_SIZE),
+                                      max(1, frame.height * size // EMOJI_SIZE)), Image.LANCZOS) for frame in kept]
+            kept = [frame.quantize(colors, method=Image.FASTOCTREE) for frame in kept]
+            output = io.BytesIO()
+            kept[0].save(output, format="GIF", save_all=True, append_images=kept[1:], duration=kept_durations,
+                         loop=image.info.get("loop", 0), optimize=True, disposal=2)
+            if output.tell() <= limit:
+                return output.getvalue(), True
+            if step < 4 and len(frames) // (step * 2) >= 2:
+                step *= 2
+            elif size > 48:
+                size -= 32
+            else:
+                break
+        step = 1
+        size = EMOJI_SIZE
+    raise ValueError("не удалось уменьшить GIF до 256 КБ")
+
+
+def parse_sources(text: str, catalog: EmojiCatalog) -> Tuple[List[Source], List[ImportResult]]:
+    """Ссылки и id/названия emoji.gg из текста команды"""
+    sources = []
+    errors = []
+    for item in re.split(r"[\s,]+", text or ""):
+        if not item:
+            continue
+        if item.startswith(("http://", "https://")):
+            path = urlparse(item).path
+            sources.append(Source(emoji_name(os.path.splitext(os.path.basename(path))[0] or "emoji"), url=item))
+            continue
+        emoji = catalog.get(item)
+        if emoji is None:
+            errors.append(ImportResult(item, None, "не найдено на emoji.gg"))
+        else:
+            sources.append(Source(emoji_name(emoji["slug"]), url=emoji["image"]))
+    return sources, errors
+
+
+def read_archive(data: bytes, max_files: int = 200, max_file_bytes: int = 16 * 1024 * 1024,
+                 max_total_bytes: int = 64 * 1024 * 1024) -> List[Source]:
+    """Картинки из zip-архива; название эмодзи - имя файла.
+
+    Размерам из заголовков архива верить нельзя, поэтому распакованные байты
+    считаются по факту: файл больше max_file_bytes пропускается, а после
+    max_total_bytes на все файлы чтение архива прекращается.
+    """
+    sources = []
+    budget = max_total_bytes
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in archive.infolist()[:max_files]:
+            if info.is_dir() or not info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            # Архив не распаковывается целиком: слишком большие по заголовку файлы пропускаются сразу
+            if info.file_size > max_file_bytes:
+                continue
+            with archive.open(info) as file:
+                content = file.read(min(max_file_bytes, budget) + 1)
+            budget -= len(content)
+            if budget < 0:
+                break
+            if len(content) > max_file_bytes:
+                continue
+            name = os.path.splitext(os.path.basename(info.filename))[0]
+            sources.append(Source(emoji_name(name), data=content))
+    return sources
+
+
+class EmojiImporter:
+    """Массовая загрузка эмодзи: скачивание параллельно, обработка в потоках,
+    загрузка в Discord по одному с паузой, чтобы не упираться в лимит."""
+
+    def __init__(self, http: HTTPClient, concurrency: int = 4, upload_interval: float = 1.0,
+                 max_download: int = 8 * 1024 * 1024):
+        self.http = http
+        self.concurrency = concurrency
+        self.upload_interval = upload_interval
+        self.max_download = max_download
+
+    async def run(self, guild: discord.Guild, sources: List[Source], reason: Optional[str] = None) -> List[ImportResult]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def prepare(source: Source):
+            async with semaphore:
+                try:
+                    data = source.data
+                    if data is None:
+                        data = await self.http.get_bytes(source.url, max_body=self.max_download)
+                    return await loop.run_in_executor(None, shrink_image, data)
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    return f"ошибка загрузки: {e.__class__.__name__}"
+                except ResponseTooLarge:
+                    return "файл слишком большой"
+                except Exception as e:
+                    return f"не картинка или повреждена: {e}"
+
+        # Скачивание и обработка идут параллельно, загрузка начинается с первых готовых
+        tasks = [asyncio.ensure_future(prepare(source)) for source in sources]
+        taken = {emoji.name for emoji in guild.emojis}
+        static_left = guild.emoji_limit - sum(1 for emoji in guild.emojis if not emoji.animated)
+        animated_left = guild.emoji_limit - sum(1 for emoji in guild.emojis if emoji.animated)
+
+        results = []
+        first = True
+        for source, task in zip(sources, tasks):
+            prepared = await task
+            if isinstance(prepared, str):
+                results.append(ImportResult(source.name, None, prepared))
+                continue
+            data, animated = prepared
+            if (animated_left if animated else static_left) <= 0:
+                results.append(ImportResult(source.name, None, "на сервере нет свободных слотов"))
+                continue
+
+            name = source.name
+            suffix = 1
+            while name in taken:
+                suffix += 1
+                name = f"{source.name[:29]}_{suffix}"
+
+            if not first:
+                await asyncio.sleep(self.upload_interval)
+            first = False
+            try:
+                emoji = await guild.create_custom_emoji(name=name, image=data, reason=reason)
+            except discord.HTTPException as e:
+                results.append(ImportResult(name, None, f"Discord: {e.text or e.status}"))
+                continue
+            taken.add(name)
+            if animated:
+                animated_left -= 1
+            else:
+                static_left -= 1
+            results.append(ImportResult(name, emoji, None))
+        return results
+
+
+def format_summary(results: List[ImportResult], limit: int = 1900) -> str:
+    added = [result for result in results if result.emoji is not None]
+    failed = [result for result in results if result.emoji is None]
+    lines = [f"✅ Добавлено: {len(added)}, ❌ ошибок: {len(failed)}"]
+    if added:
+        lines.append(" ".join(str(result.emoji) for result in added))
+    lines.extend(f"- {result.name}: {result.error}" for result in failed)
+    text = "\n".join(lines)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
@@ -0,0 +1,97 @@
+import ast
+import logging
+import os
+import sys
+from typing import Iterable, List, Optional, Tuple
+
+import discord
+
+log = logging.getLogger(__name__)
+
+
+def declared_intents(path: str) -> Optional[Tuple[str, ...]]:
+    """INTENTS из файла модуля без его импорта (модуль потом загружает discord.py).
+
+    None - модуль не объявил, какие события ему нужны.
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "INTENTS" for target in node.targets):
+            return tuple(ast.literal_eval(node.value))
+    return None
+
+
+def required_intents(base: Iterable[str], folders: List[str], root: str = "Modules") -> discord.Intents:
+    """Только те события гейтвея, которые нужны главному файлу и модулям из folders.
+
+    Модуль без INTENTS получает все события: так он не сломается молча.
+    """
+    names = set(base)
+    for folder in folders:
+        path = os.path.join(root, folder, "main.py")
+        try:
+            declared = declared_intents(path)
+        except (OSError, SyntaxError, ValueError) as e:
+            log.warning(f"Не удалось прочитать INTENTS модуля {folder}: {e}", extra={"cog": folder})
+            declared = None
+        if declared is None:
+            log.warning(f"Модуль {folder} не объявил INTENTS, включены все события", extra={"cog": folder})
+            return discord.Intents.all()
+        names.update(declared)
+
+    intents = discord.Intents.none()
+    for name in names:
+        if name not in discord.Intents.VALID_FLAGS:
+            raise ValueError(f"неизвестный intent: {name}")
+        setattr(intents, name, True)
+    return intents
+
+
+def client_options(lean: bool, base: Iterable[str], folders: List[str], max_messages: Optional[int]) -> dict:
+    """Параметры commands.Bot для гейтвея: в экономном режиме без кэша участников,
+    без загрузки списков участников при старте и с небольшим кэшем сообщений."""
+    if not lean:
+        return {"intents": discord.Intents.all()}
+    intents = required_intents(base, folders)
+    return {
+        "intents": intents,
+        # Без intent members кэшируются только участники из событий голосовых каналов (если они нужны)
+        "member_cache_flags": discord.MemberCacheFlags.from_intents(intents),
+        "chunk_guilds_at_startup": intents.members,
+        "max_messages": max_messages or None
+    }
+
+
+def shard_of(guild_id: int, shard_count: int) -> int:
+    """Шард, к которому Discord относит сервер"""
+    return (guild_id >> 22) % shard_count
+
+
+def owns_all_shards(bot: discord.Client) -> bool:
+    """Все шарды в этом процессе (или бот без шардов)"""
+    shard_ids = getattr(bot, "shard_ids", None)
+    return shard_ids is None or bot.shard_count is None or len(set(shard_ids)) >= bot.shard_count
+
+
+def owns_guild(bot: discord.Client, guild_id: int) -> bool:
+    """События сервера guild_id приходят в этот процесс"""
+    if owns_all_shards(bot):
+        return True
+    return shard_of(guild_id, bot.shard_count) in bot.shard_ids
+
+
+def rss_bytes() -> int:
+    """Резидентная память процесса (RSS), байт"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # Без /proc доступен только пик RSS: в КБ на Linux, в байтах на macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,70 @@
+import json
+from typing import Any, Optional
+
+import aiohttp
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class HTTPClient:
+    """Общий HTTP-клиент бота: одна сессия aiohttp с пулом соединений и кэшем DNS.
+
+    Создаётся при запуске бота (bot.http_client) и закрывается при выключении;
+    модули не создают свои ClientSession.
+    """
+
+    def __init__(self, timeout: float = 30.0, connect_timeout: float = 10.0, limit: int = 100,
+                 limit_per_host: int = 10, dns_ttl: int = 300, max_body: int = 10 * 1024 * 1024):
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.max_body = max_body
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self) -> None:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, raise_for_status=False)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTP client is not started")
+        return self._session
+
+    async def get_bytes(self, url: str, max_body: Optional[int] = None, **kwargs) -> bytes:
+        """Тело ответа целиком; ответ больше max_body не дочитывается"""
+        async with self.session.get(url, **kwargs) as response:
+            response.raise_for_status()
+            return await self.read_limited(response, max_body)
+
+    async def get_json(self, url: str, max_body: Optional[int] = None, **kwargs) -> Any:
+        return json.loads(await self.get_bytes(url, max_body, **kwargs))
+
+    async def post_json(self, url: str, data: Any, **kwargs) -> aiohttp.ClientResponse:
+        async with self.session.post(url, json=data, **kwargs) as response:
+            await response.read()
+            return response
+
+    async def read_limited(self, response: aiohttp.ClientResponse, max_body: Optional[int] = None) -> bytes:
+        limit = self.max_body if max_body is None else max_body
+        if response.content_length is not None and response.content_length > limit:
+            raise ResponseTooLarge(f"Response is {response.content_length} bytes, limit is {limit}")
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > limit:
+                raise ResponseTooLarge(f"Response is larger than {limit} bytes")
+        return bytes(body)
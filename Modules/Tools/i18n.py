@@ -0,0 +1,161 @@
+import json
+import os
+from typing import Dict, Optional, Union
+
+import discord
+
+import config
+
+# Локали Discord, у которых каталог называется иначе, чем язык
+LOCALE_ALIASES = {"zh-TW": "tc", "zh-CN": "zh", "pt-BR": "pt", "es-ES": "es", "sv-SE": "sv"}
+
+
+class Translator:
+    """Каталог одного модуля на одном языке; вызов - поиск строки в словаре и format"""
+
+    __slots__ = ("locale", "_strings", "_fallback")
+
+    def __init__(self, locale: str, strings: Dict[str, str], fallback: Optional["Translator"] = None):
+        self.locale = locale
+        self._strings = strings
+        self._fallback = fallback
+
+    def __call__(self, key: str, *args) -> str:
+        template = self._strings.get(key)
+        if template is None:
+            if self._fallback is not None:
+                return self._fallback(key, *args)
+            return key
+        return template.format(*args) if args else template
+
+
+class Localization:
+    """Каталоги Lang/<Module>/<module>_<locale>.json для всех модулей бота.
+
+    Каталог читается один раз при первом обращении к языку и хранится
+    в памяти уже "плоским" словарём ключей вида "embed.update.online.title".
+    Язык выбирается так: язык, заданный для сервера, затем язык
+    пользователя (для ответов на команды) или сервера Discord, затем язык по умолчанию.
+    """
+
+    def __init__(self, root: str = "Lang", default: str = "ru", fallback: str = "ru",
+                 guild_locales_path: Optional[str] = None):
+        self.root = root
+        self.default = default
+        self.fallback = fallback
+        self.guild_locales_path = guild_locales_path
+        self._translators: Dict[tuple, Translator] = {}
+        self._guild_locales: Optional[Dict[int, str]] = None
+
+    def get(self, module: str, locale: Optional[str] = None) -> Translator:
+        locale = self.normalize(locale) if locale else self.default
+        key = (module, locale)
+        translator = self._translators.get(key)
+        if translator is None:
+            translator = self._translators[key] = self._load(module, locale)
+        return translator
+
+    def for_guild(self, module: str, guild: Optional[discord.Guild]) -> Translator:
+        """Язык для сообщений в канале: выбранный для сервера или язык сервера Discord"""
+        return self.get(module, self.guild_locale(guild))
+
+    def for_interaction(self, module: str, interaction: discord.Interaction) -> Translator:
+        """Язык ответа на команду: выбранный для сервера или язык пользователя"""
+        locale = self._guild_setting(interaction.guild_id)
+        if locale is None:
+            locale = self._available(module, interaction.locale) or self.guild_locale(interaction.guild)
+        return self.get(module, locale)
+
+    def guild_locale(self, guild: Optional[discord.Guild]) -> str:
+        if guild is None:
+            return self.default
+        locale = self._guild_setting(guild.id)
+        if locale is None and "COMMUNITY" in guild.features:
+            # Язык сервера Discord задаётся только у серверов сообщества
+            locale = self.normalize(guild.preferred_locale)
+        return locale or self.default
+
+    def set_guild_locale(self, guild_id: int, locale: Optional[str]) -> None:
+        """Выбор языка для сервера (None - снова по языку сервера Discord)"""
+        settings = self._load_guild_locales()
+        if locale is None:
+            settings.pop(guild_id, None)
+        else:
+            settings[guild_id] = self.normalize(locale)
+        if self.guild_locales_path:
+            directory = os.path.dirname(self.guild_locales_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.guild_locales_path, "w", encoding="utf-8") as f:
+                json.dump({str(k): v for k, v in settings.items()}, f)
+
+    def locales(self, module: str) -> list:
+        """Языки, для которых у модуля есть каталог"""
+        prefix = f"{module.lower()}_"
+        directory = os.path.join(self.root, module)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            name[len(prefix):-5] for name in os.listdir(directory)
+            if name.startswith(prefix) and name.endswith(".json") and os.path.getsize(os.path.join(directory, name))
+        )
+
+    def clear(self) -> None:
+        """Сброс кэша каталогов (после правки файлов)"""
+        self._translators.clear()
+
+    @staticmethod
+    def normalize(locale: Union[str, discord.Locale]) -> str:
+        locale = str(locale.value if isinstance(locale, discord.Locale) else locale)
+        return LOCALE_ALIASES.get(locale, locale.split("-")[0].lower())
+
+    def _available(self, module: str, locale) -> Optional[str]:
+        if locale is None:
+            return None
+        locale = self.normalize(locale)
+        return locale if self.get(module, locale).locale == locale else None
+
+    def _guild_setting(self, guild_id: Optional[int]) -> Optional[str]:
+        if guild_id is None:
+            return None
+        return self._load_guild_locales().get(guild_id)
+
+    def _load_guild_locales(self) -> Dict[int, str]:
+        if self._guild_locales is None:
+            self._guild_locales = {}
+            if self.guild_locales_path and os.path.exists(self.guild_locales_path):
+                with open(self.guild_locales_path, encoding="utf-8") as f:
+                    self._guild_locales = {int(k): v for k, v in json.load(f).items()}
+        return self._guild_locales
+
+    def _load(self, module: str, locale: str) -> Translator:
+        fallback = None
+        if locale != self.fallback:
+            fallback = self.get(module, self.fallback)
+        path = os.path.join(self.root, module, f"{module.lower()}_{locale}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                strings = flatten(json.load(f))
+        except (OSError, ValueError):
+            # Нет каталога или он пустой/битый: используется запасной язык
+            if fallback is not None:
+                return fallback
+            strings = {}
+        return Translator(locale, strings, fallback)
+
+
+def flatten(data: dict, prefix: str = "") -> Dict[str, str]:
+    result = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            result.update(flatten(value, f"{prefix}{key}."))
+        else:
+            result[f"{prefix}{key}"] = value
+    return result
+
+
+i18n = Localization(
+    default=config.LOCALIZATION["default"],
+    fallback=config.LOCALIZATION["fallback"],
+    guild_locales_path=config.LOCALIZATION["guild_locales_path"]
+)
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from typing import Any, Optional
+
+import aiosqlite
+
+log = logging.getLogger(__name__)
+
+
+class Lease:
+    """Роль лидера среди процессов бота на одной машине через общую базу SQLite.
+
+    Лидер продлевает аренду каждые ttl / 3 секунд; если процесс упал,
+    через ttl секунд роль забирает другой. Лидер выполняет общие для всех
+    процессов задачи (статус бота, чистка статистики, синхронизация команд)
+    и публикует их результат в ту же базу, откуда его читают остальные.
+    """
+
+    def __init__(self, path: str, name: str = "leader", ttl: float = 30.0, owner: Optional[str] = None):
+        self.path = path
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self.is_leader = False
+        self._db: Optional[aiosqlite.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._db = await aiosqlite.connect(self.path, timeout=self.ttl / 3)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)"
+        )
+        await self._db.execute(
+            "CREATE TABLE IF NOT EXISTS shared (key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        await self._db.commit()
+        await self.acquire()
+        self._task = asyncio.ensure_future(self._renew())
+
+    async def acquire(self) -> bool:
+        """Продление своей аренды или захват истёкшей; True, если процесс - лидер"""
+        now = time.time()
+        try:
+            # Одна команда: строка меняется, только если аренда своя или уже истекла
+            await self._db.execute(
+                "INSERT INTO lease (name, owner, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires = excluded.expires "
+                "WHERE lease.owner = excluded.owner OR lease.expires < ?",
+                (self.name, self.owner, now + self.ttl, now)
+            )
+            await self._db.commit()
+            rows = await self._db.execute_fetchall("SELECT owner FROM lease WHERE name = ?", (self.name,))
+        except Exception as e:
+            # База занята или недоступна: без продления лидер не может считать себя лидером
+            log.warning(f"Не удалось продлить аренду {self.name}: {e}")
+            rows = []
+        leader = bool(rows) and rows[0][0] == self.owner
+        if leader != self.is_leader:
+            log.info(f"{'Получена' if leader else 'Потеряна'} роль лидера", extra={"lease": self.name, "owner": self.owner})
+        self.is_leader = leader
+        return leader
+
+    async def publish(self, key: str, value: Any) -> None:
+        await self._db.execute(
+            "INSERT INTO shared (key, value, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated",
+            (key, json.dumps(value, ensure_ascii=False), time.time())
+        )
+        await self._db.commit()
+
+    async def read(self, key: str, default: Any = None) -> Any:
+        rows = await self._db.execute_fetchall("SELECT value FROM shared WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else default
+
+    async def close(self) -> None:
+        """Остановка продления; своя аренда освобождается сразу, а не через ttl"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._db is None:
+            return
+        try:
+            await self._db.execute("DELETE FROM lease WHERE name = ? AND owner = ?", (self.name, self.owner))
+            await self._db.commit()
+        finally:
+            self.is_leader = False
+            await self._db.close()
+            self._db = None
+
+    async def _renew(self) -> None:
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            await self.acquire()
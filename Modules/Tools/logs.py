@@ -0,0 +1,96 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Стандартные поля LogRecord: всё остальное пришло через extra и пишется в JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+# Трассировки для записей в очереди рендерятся до передачи в поток записи
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON; поля из extra добавляются как есть"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Постановка записи в очередь без склейки трассировки с сообщением.
+
+    Стандартный prepare дописывает трассировку в msg и очищает exc_info,
+    поэтому в JSON она попадала в "message", а не в поле "exc". Здесь она
+    рендерится в exc_text: его выводят и JsonFormatter, и консольный Formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Аргументы подставляются сразу: к моменту записи в другом потоке они могут измениться
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogListener(logging.handlers.QueueListener):
+    def stop(self) -> None:
+        # Повторная остановка (вручную и при выходе) ничего не делает
+        if self._thread is not None:
+            super().stop()
+
+
+def setup_logging(path: str, level: str = "INFO", module_levels: Optional[Dict[str, str]] = None,
+                  max_bytes: int = 10 * 1024 * 1024, backups: int = 5,
+                  console_level: str = "INFO") -> LogListener:
+    """Логирование через очередь: запись в файл и консоль идёт в отдельном потоке.
+
+    В event loop остаются только проверка уровня и постановка записи в
+    очередь. Файл - JSON lines с ротацией по размеру.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter())
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    listener = LogListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LogQueueHandler(log_queue))
+    root.setLevel(level)
+    for name, module_level in (module_levels or {}).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    listener.start()
+    # Оставшиеся в очереди записи дописываются при выходе
+    atexit.register(listener.stop)
+    return listener
@@ -1,6 +1,9 @@
 import discord
 from discord.ext import commands
-import requests, json
+import json
+
+# События гейтвея, нужные модулю (см. Modules/Tools/gateway.py): команды с префиксом
+INTENTS = ("guild_messages", "message_content")
 
 class Tools(commands.Cog):
     def __init__(self, bot: commands.Bot):
@@ -21,11 +24,10 @@ class Tools(commands.Cog):
         except:
             return await ctx.respond(embed=embed, view=view)
     
-    async def webhook(ctx, url, file):
-        data = json.load(file)
-
-        headers={"Content-Type": "application/json"}
-        requests.post(url, data=json.dumps(data), headers=headers)
+    async def send_webhook(http, url, data: dict):
+        """Отправка сообщения вебхуком через общий HTTP-клиент бота"""
+        response = await http.post_json(url, data)
+        return response.status
 
 
     @commands.command(name='webhook')
@@ -34,8 +36,17 @@ class Tools(commands.Cog):
         #     await Tools.respond(ctx, embed=discord.Embed(title="Webhook").add_field(name="**Commands**", value="**\n!webhook create <id> <avatar_url>\n!webhook delete <id>\n!webhook list\n!webhook message <SendWithFile.json (Guide)[https://birdie0.github.io/discord-webhooks-guide/structure/username.html]>**"))
         if len(ctx.message.attachments) == 0:
             return await Tools.respond(ctx, "Прикрепите файл", color=0xff0000)
+        if not args:
+            return await Tools.respond(ctx, "Укажите ссылку вебхука", color=0xff0000)
         attachment = ctx.message.attachments[0]
-        Tools.webhook(ctx, args[0], attachment)
+        try:
+            data = json.loads(await attachment.read())
+        except ValueError:
+            return await Tools.respond(ctx, "Файл не является JSON", color=0xff0000)
+        status = await Tools.send_webhook(self.bot.http_client, args[0], data)
+        if status >= 400:
+            return await Tools.respond(ctx, f"Ошибка отправки вебхука | Код ответа: {status}", color=0xff0000)
+        await Tools.respond(ctx, "Сообщение отправлено", color=0x00ff00)
         
 
 
@@ -0,0 +1,247 @@
+import asyncio
+import bisect
+import functools
+import logging
+import re
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+
+from Modules.Tools.gateway import rss_bytes
+
+log = logging.getLogger(__name__)
+
+# Границы корзин гистограмм, секунды
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами: запись - бинарный поиск и пара сложений"""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по верхней границе корзины"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        total = 0
+        for index, count in enumerate(self.counts):
+            total += count
+            if total >= rank:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return self.max
+
+
+class Metrics:
+    """Счётчики и гистограммы бота, общие для всех модулей.
+
+    Стоимость записи - несколько операций со словарём, поэтому замеры
+    остаются включёнными и в проде.
+    """
+
+    def __init__(self, lag_interval: float = 0.5, memory_interval: float = 300.0):
+        self.lag_interval = lag_interval
+        self.memory_interval = memory_interval
+        self.started = time.time()
+        self.histograms: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.counters: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.gauges: Dict[Tuple[str, str], float] = {}
+        # Функции, которые возвращают текущие значения (название, метка, значение), например размеры кэшей
+        self.collectors: List[Callable[[], Iterable[Tuple[str, str, float]]]] = []
+        self.lag_max = 0.0
+        self._lag_task: Optional[asyncio.Task] = None
+        self._memory_task: Optional[asyncio.Task] = None
+        self._runner: Optional[web.AppRunner] = None
+
+    def observe(self, name: str, value: float, label: str = "") -> None:
+        self.histograms[(name, label)].observe(value)
+
+    def inc(self, name: str, label: str = "", value: int = 1) -> None:
+        self.counters[(name, label)] += value
+
+    def set(self, name: str, value: float, label: str = "") -> None:
+        self.gauges[(name, label)] = value
+
+    def collect(self) -> None:
+        """Обновление значений: память процесса и всё, что отдают collectors"""
+        self.set("memory_rss_bytes", rss_bytes())
+        for collector in self.collectors:
+            try:
+                for name, label, value in collector():
+                    self.set(name, value, label)
+            except Exception as e:
+                log.warning(f"Ошибка сбора метрик: {e}")
+
+    def timer(self, name: str, label: str = "") -> "Timer":
+        return Timer(self, name, label)
+
+    def timed(self, name: str):
+        """Декоратор корутины: длительность каждого вызова пишется в гистограмму name"""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def http_trace(self) -> aiohttp.TraceConfig:
+        """TraceConfig для сессии discord.py: число REST-запросов по статусам и 429"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            context.start = time.perf_counter()
+
+        async def on_request_end(session, context, params):
+            status = params.response.status
+            self.inc("discord_rest_requests", str(status))
+            self.observe("discord_rest", time.perf_counter() - context.start, params.method)
+            if status == 429:
+                self.inc("discord_rest_ratelimited", rest_route(params.method, params.url.path))
+
+        async def on_request_exception(session, context, params):
+            self.inc("discord_rest_requests", "error")
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        return trace
+
+    def start(self) -> None:
+        """Запуск замера задержки event loop и памяти (повторный вызов ничего не делает)"""
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.ensure_future(self._measure_lag())
+        if self.memory_interval and (self._memory_task is None or self._memory_task.done()):
+            self._memory_task = asyncio.ensure_future(self._report_memory())
+
+    async def stop(self) -> None:
+        for task in (self._lag_task, self._memory_task):
+            if task is not None:
+                task.cancel()
+        self._lag_task = None
+        self._memory_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def serve(self, host: str, port: int) -> None:
+        """Локальный HTTP-эндпоинт /metrics в текстовом формате Prometheus"""
+        if self._runner is not None:
+            return
+
+        async def handle(request):
+            return web.Response(text=self.render_prometheus(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+
+    async def _measure_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - start - self.lag_interval)
+            self.observe("event_loop_lag", lag)
+            if lag > self.lag_max:
+                self.lag_max = lag
+
+    async def _report_memory(self) -> None:
+        while True:
+            self.collect()
+            log.info(
+                f"Память: {self.gauges[('memory_rss_bytes', '')] / 2 ** 20:.0f} МБ",
+                extra={name if not label else f"{name}_{label}": value for (name, label), value in self.gauges.items()}
+            )
+            await asyncio.sleep(self.memory_interval)
+
+    def summary(self) -> List[Tuple[str, str]]:
+        """Строки (название, значение) для команды /metrics"""
+        self.collect()
+        rows = []
+        for (name, label), value in sorted(self.gauges.items()):
+            title = f"{name} [{label}]" if label else name
+            rows.append((title, f"{value / 2 ** 20:.1f} МБ" if name.endswith("_bytes") else str(value)))
+        for (name, label), histogram in sorted(self.histograms.items()):
+            title = f"{name} [{label}]" if label else name
+            rows.append((title, (
+                f"{histogram.count} шт., среднее {histogram.sum / histogram.count * 1000:.1f} мс, "
+                f"p95 ≤ {histogram.quantile(0.95) * 1000:.0f} мс, макс. {histogram.max * 1000:.0f} мс"
+            )))
+        counters = defaultdict(list)
+        for (name, label), value in sorted(self.counters.items()):
+            counters[name].append(f"{label}: {value}" if label else str(value))
+        for name, values in counters.items():
+            rows.append((name, ", ".join(values)))
+        return rows
+
+    def render_prometheus(self) -> str:
+        self.collect()
+        lines = [f"bot_uptime_seconds {time.time() - self.started:.0f}", f"bot_event_loop_lag_max_seconds {self.lag_max:.6f}"]
+        for (name, label), value in sorted(self.gauges.items()):
+            suffix = f'{{label="{label}"}}' if label else ""
+            lines.append(f"bot_{name}{suffix} {value}")
+        for (name, label), histogram in sorted(self.histograms.items()):
+            labels = f'label="{label}",' if label else ""
+            total = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), histogram.counts):
+                total += count
+                lines.append(f'bot_{name}_seconds_bucket{{{labels}le="{bound}"}} {total}')
+            suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"bot_{name}_seconds_sum{suffix} {histogram.sum:.6f}")
+            lines.append(f"bot_{name}_seconds_count{suffix} {histogram.count}")
+        for (name, label), value in sorted(self.counters.items()):
+            suffix = f'{{label="{label}"}}' if label else ""
+            lines.append(f"bot_{name}_total{suffix} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class Timer:
+    __slots__ = ("metrics", "name", "label", "start")
+
+    def __init__(self, metrics: Metrics, name: str, label: str):
+        self.metrics = metrics
+        self.name = name
+        self.label = label
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, self.label)
+
+
+def rest_route(method: str, path: str) -> str:
+    """Шаблон маршрута REST API для метки: без версии API, ID, токенов и эмодзи,
+    иначе каждое сообщение или канал давали бы новую метку"""
+    path = re.sub(r"^/api/v\d+", "", path)
+    path = re.sub(r"/(webhooks|interactions)/(\d+)/[^/]+", r"/\1/\2/{token}", path)
+    path = re.sub(r"/reactions/[^/]+", "/reactions/{emoji}", path)
+    path = re.sub(r"\d+", "{id}", path)
+    return f"{method} {path}"
+
+
+metrics = Metrics()
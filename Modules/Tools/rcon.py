@@ -1,19 +1,43 @@
 import asyncio
 import struct
-from typing import Optional
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 class RCONError(Exception):
     pass
 
+class RCONNotSent(RCONError):
+    """Команда не была отправлена: её можно безопасно повторить на новом соединении"""
+
+class RCONTimeout(RCONError):
+    """Сервер не ответил вовремя; команда могла выполниться, повторять её нельзя"""
+
 class RCONClient:
-    def __init__(self, host: str, port: int, password: str, timeout: float = 5.0):
+    """RCON-соединение в одном из двух режимов.
+
+    Конец ответа в обоих режимах - эхо отдельного пакета-маркера: сервер
+    отвечает на него после всех фрагментов ответа на команду.
+    pipelined=False (ванильный сервер): сервер читает сокет по одному пакету
+    и закрывает соединение, если в одном чтении оказалось два пакета. Поэтому
+    в полёте одна команда, а маркер отправляется, только когда пришёл первый
+    фрагмент ответа - сервер к этому времени уже прочитал команду.
+    pipelined=True: команды отправляются не дожидаясь ответов, маркер - сразу
+    за командой.
+    """
+
+    def __init__(self, host: str, port: int, password: str, timeout: float = 5.0, pipelined: bool = False):
         self.host = host
         self.port = port
         self.password = password
         self.timeout = timeout
+        self.pipelined = pipelined
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self._request_id = 0
+        self._pending: Dict[int, dict] = {}
+        self._markers: Dict[int, int] = {}
+        self._write_lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
         """Установка соединения с RCON-сервером"""
@@ -25,35 +49,85 @@ class RCONClient:
             await self._authenticate()
         except (asyncio.TimeoutError, ConnectionRefusedError) as e:
             raise RCONError(f"Connection failed: {str(e)}") from e
+        self._reader_task = asyncio.ensure_future(self._read_loop())
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None and not self.writer.is_closing()
+
+    @property
+    def busy(self) -> bool:
+        """Есть ли команды, ожидающие ответа"""
+        return bool(self._pending)
 
     async def close(self) -> None:
         """Закрытие соединения"""
+        if self._reader_task and self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+        self._reader_task = None
+        self._fail_pending(RCONError("Connection closed"))
         if self.writer:
-            self.writer.close()
-            await self.writer.wait_closed()
+            writer = self.writer
             self.writer = None
             self.reader = None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
 
     async def send_command(self, command: str) -> str:
-        """Отправка команды на сервер"""
-        if not self.writer or not self.reader:
-            raise RCONError("Not connected")
+        """Отправка команды на сервер.
+
+        Безопасно вызывать одновременно: ответы сопоставляются с запросами
+        по ID пакета фоновой задачей чтения.
+        """
+        request_id = self._next_id()
+        future = asyncio.get_running_loop().create_future()
+        request = {'future': future, 'body': bytearray(), 'marker': None}
 
-        self._request_id += 1
-        packet = self._create_packet(2, command)
-        
         try:
-            self.writer.write(packet)
-            await asyncio.wait_for(self.writer.drain(), timeout=self.timeout)
-            
-            response = await self._read_response(self._request_id)
-            return response.strip('\x00')
+            async with self._write_lock:
+                # Проверка под замком: соединение могли закрыть, пока команда ждала очереди.
+                # Запрос регистрируется только после неё: иначе close() выставил бы ошибку
+                # будущему, которое уже никто не ждёт
+                if not self.connected:
+                    raise RCONNotSent("Not connected")
+                self._pending[request_id] = request
+                self.writer.write(self._create_packet(2, command, request_id))
+                await asyncio.wait_for(self.writer.drain(), timeout=self.timeout)
+
+                if not self.pipelined:
+                    # Следующая команда уходит только после ответа на эту
+                    try:
+                        return await asyncio.wait_for(future, timeout=self.timeout)
+                    except asyncio.TimeoutError:
+                        # Сервер ещё занят этой командой: новые пакеты копились бы в его сокете,
+                        # а ванильный сервер закрывает соединение, прочитав два пакета разом
+                        await self.close()
+                        raise
+
+                self._send_marker(request_id, request)
+                await asyncio.wait_for(self.writer.drain(), timeout=self.timeout)
+
+            return await asyncio.wait_for(future, timeout=self.timeout)
         except asyncio.TimeoutError as e:
-            raise RCONError("Command timed out") from e
+            raise RCONTimeout("Command timed out") from e
+        finally:
+            self._pending.pop(request_id, None)
+            if request['marker'] is not None:
+                self._markers.pop(request['marker'], None)
+
+    def _send_marker(self, request_id: int, request: dict) -> None:
+        """Отдельный пакет пустого ответа (тип 0), эхо которого закрывает ответ на команду"""
+        marker_id = self._next_id()
+        request['marker'] = marker_id
+        self._markers[marker_id] = request_id
+        self.writer.write(self._create_packet(0, '', marker_id))
 
     async def _authenticate(self) -> None:
         """Аутентификация на сервере"""
-        auth_packet = self._create_packet(3, self.password)
+        auth_packet = self._create_packet(3, self.password, self._next_id())
         self.writer.write(auth_packet)
         await self.writer.drain()
 
@@ -62,41 +136,65 @@ class RCONClient:
             await self.close()
             raise RCONError("Authentication failed")
 
-    def _create_packet(self, ptype: int, body: str) -> bytes:
+    def _next_id(self) -> int:
+        # ID пакета - знаковое 32-битное число, -1 зарезервирован сервером
+        self._request_id = self._request_id % 0x7FFFFFFF + 1
+        return self._request_id
+
+    def _create_packet(self, ptype: int, body: str, packet_id: int) -> bytes:
         """Создание RCON-пакета"""
         body_bytes = body.encode('utf-8') + b'\x00\x00'
-        packet_id = self._request_id
         packet = struct.pack('<3i', 
-                            len(body_bytes) + 10,  # Длина пакета
+                            len(body_bytes) + 8,   # Длина пакета (ID + тип + тело)
                             packet_id,              # ID запроса
                             ptype)                  # Тип пакета
         packet += body_bytes
         return packet
 
-    async def _read_response(self, expected_id: int) -> str:
-        """Чтение ответа от сервера (с обработкой многопакетных ответов)"""
-        response = []
-        while True:
-            packet = await self._read_packet()
-            
-            if packet['id'] != expected_id:
-                raise RCONError("Invalid response ID")
-            
-            response.append(packet['body'])
-            
-            # Проверка на завершение пакета (для Source Engine)
-            if len(packet['body']) < 4096:
-                break
-                
-        return ''.join(response)
-
-    async def _read_packet(self) -> dict:
-        """Чтение и парсинг одного RCON-пакета"""
+    async def _read_loop(self) -> None:
+        """Фоновое чтение пакетов и передача ответов ожидающим командам"""
+        try:
+            while True:
+                packet = await self._read_packet(idle=True)
+
+                if packet['id'] in self._markers:
+                    # Эхо маркера: все фрагменты ответа уже получены
+                    request = self._pending.get(self._markers.pop(packet['id']))
+                    if request is not None and not request['future'].done():
+                        body = request['body'].decode('utf-8', errors='replace')
+                        request['future'].set_result(body.strip('\x00'))
+                    continue
+
+                request = self._pending.get(packet['id'])
+                # Ответ на команду, которая уже завершилась по таймауту, отбрасывается
+                if request is not None and not request['future'].done():
+                    request['body'] += packet['body']
+                    # Ванильный сервер прочитал команду и отвечает на неё: теперь маркер
+                    # придёт в отдельном чтении. send_command держит замок записи до ответа
+                    if not self.pipelined and request['marker'] is None and self.connected:
+                        self._send_marker(packet['id'], request)
+        except asyncio.CancelledError:
+            raise
+        except (RCONError, asyncio.TimeoutError, ConnectionError, OSError) as e:
+            self._fail_pending(RCONError(f"Connection lost: {e}"))
+            await self.close()
+
+    def _fail_pending(self, error: Exception) -> None:
+        for request in self._pending.values():
+            if not request['future'].done():
+                request['future'].set_exception(error)
+
+    async def _read_packet(self, idle: bool = False) -> dict:
+        """Чтение и парсинг одного RCON-пакета.
+
+        При idle=True длина пакета ожидается без таймаута: соединение
+        может простаивать между командами.
+        """
         try:
             # Чтение длины пакета (4 байта, little-endian)
             size_data = await asyncio.wait_for(
                 self.reader.readexactly(4),
-                timeout=self.timeout
+                timeout=None if idle else self.timeout
             )
             size = struct.unpack('<i', size_data)[0]
 
@@ -108,14 +206,13 @@ class RCONClient:
         except asyncio.IncompleteReadError as e:
             raise RCONError("Connection lost") from e
 
-        # Распаковка заголовка пакета
+        # Распаковка заголовка пакета; тело декодируется после сборки всех фрагментов
         packet_id, ptype = struct.unpack('<2i', packet_data[:8])
-        body = packet_data[8:-2].decode('utf-8', errors='replace')
         
         return {
             'id': packet_id,
             'type': ptype,
-            'body': body
+            'body': packet_data[8:-2]
         }
 
     async def __aenter__(self):
@@ -123,4 +220,135 @@ class RCONClient:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.close()
\ No newline at end of file
+        await self.close()
+
+
+class RCONPool:
+    """Пул постоянных RCON-соединений с повторным использованием сессий.
+
+    Соединения открываются лениво при первой команде, после ошибок
+    переподключение откладывается с экспоненциальной задержкой, а
+    неиспользуемые соединения закрываются по таймауту.
+    """
+
+    def __init__(self, timeout: float = 5.0, idle_timeout: float = 300.0,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._clients: Dict[Tuple[str, int, str, bool], RCONClient] = {}
+        self._last_used: Dict[Tuple[str, int, str, bool], float] = {}
+        self._locks: Dict[Tuple[str, int, str, bool], asyncio.Lock] = {}
+        self._failures: Dict[Tuple[str, int, str, bool], Tuple[int, float]] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def execute(self, host: str, port: int, password: str, command: str, pipelined: bool = False) -> str:
+        """Выполнение команды через соединение из пула (pipelined - см. RCONClient)"""
+        key = (host, port, password, pipelined)
+        client, reused = await self._acquire(key)
+        try:
+            return await self._send(key, client, command)
+        except RCONNotSent:
+            if not reused:
+                raise
+        # Сервер мог закрыть простаивавшее соединение до отправки: одна попытка на новом.
+        # Команду, которая уже ушла на сервер, не повторяем - она выполнилась бы дважды
+        client, _ = await self._acquire(key)
+        return await self._send(key, client, command)
+
+    async def _send(self, key: Tuple[str, int, str, bool], client: RCONClient, command: str) -> str:
+        try:
+            return await client.send_command(command)
+        except RCONTimeout:
+            # С маркерами соединение живо: поздний ответ отбросится по ID, остальные
+            # команды на нём не страдают. Без маркеров клиент уже закрыл соединение сам
+            if not client.pipelined:
+                await self._discard(key, client)
+            raise
+        except (RCONError, OSError):
+            await self._discard(key, client)
+            raise
+
+    async def execute_many(self, host: str, port: int, password: str, commands: Iterable[str],
+                           depth: int = 16, pipelined: bool = False) -> List[Union[str, Exception]]:
+        """Выполнение пачки команд через одно соединение.
+
+        Одновременно в полёте не больше depth команд (без pipelined - по одной);
+        результаты возвращаются в порядке команд, ошибка отдельной команды не
+        прерывает остальные.
+        """
+        semaphore = asyncio.Semaphore(depth)
+
+        async def run(command: str) -> Union[str, Exception]:
+            async with semaphore:
+                try:
+                    return await self.execute(host, port, password, command, pipelined)
+                except (RCONError, OSError) as e:
+                    return e
+
+        return await asyncio.gather(*(run(command) for command in commands))
+
+    async def close(self) -> None:
+        """Закрытие всех соединений пула"""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+        for key in list(self._clients):
+            await self._discard(key)
+
+    async def _acquire(self, key: Tuple[str, int, str, bool]) -> Tuple[RCONClient, bool]:
+        self._last_used[key] = time.monotonic()
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.ensure_future(self._reap_idle())
+
+        client = self._clients.get(key)
+        if client and client.connected:
+            return client, True
+
+        # Одновременные команды к одному серверу ждут одно подключение
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            client = self._clients.get(key)
+            if client and client.connected:
+                return client, True
+            return await self._connect(key), False
+
+    async def _connect(self, key: Tuple[str, int, str, bool]) -> RCONClient:
+        failures, retry_at = self._failures.get(key, (0, 0.0))
+        if time.monotonic() < retry_at:
+            raise RCONError(f"Reconnect backoff: retry in {retry_at - time.monotonic():.1f}s")
+
+        host, port, password, pipelined = key
+        client = RCONClient(host, port, password, timeout=self.timeout, pipelined=pipelined)
+        try:
+            await client.connect()
+        except (RCONError, OSError) as e:
+            failures += 1
+            delay = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+            self._failures[key] = (failures, time.monotonic() + delay)
+            raise RCONError(f"Connection failed: {e}") from e
+
+        self._failures.pop(key, None)
+        self._clients[key] = client
+        return client
+
+    async def _discard(self, key: Tuple[str, int, str, bool], client: Optional[RCONClient] = None) -> None:
+        # Соединение могли уже заменить другой командой, закрываем только своё
+        if client is not None and self._clients.get(key) is not client:
+            await client.close()
+            return
+        client = self._clients.pop(key, None)
+        if client:
+            await client.close()
+
+    async def _reap_idle(self) -> None:
+        """Фоновое закрытие соединений, простаивающих дольше idle_timeout"""
+        while self._clients or self._last_used:
+            await asyncio.sleep(self.idle_timeout / 2)
+            now = time.monotonic()
+            for key, last_used in list(self._last_used.items()):
+                client = self._clients.get(key)
+                if now - last_used < self.idle_timeout or (client and client.busy):
+                    continue
+                del self._last_used[key]
+                await self._discard(key)
@@ -0,0 +1,155 @@
+import hashlib
+import inspect
+import logging
+import os
+import sys
+import types
+from typing import Dict, List, Optional, Set, Tuple
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+# Пакеты бота: только их модули отслеживаются и перезагружаются
+PACKAGES = ("Modules.", "Config.")
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def dependencies(module_name: str) -> Set[str]:
+    """Модули бота, от которых зависит модуль: импортированные модули и
+    модули, откуда взяты его классы, функции и объекты (рекурсивно)."""
+    result = set()
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        module = sys.modules.get(name)
+        if module is None or name in result:
+            continue
+        result.add(name)
+        for value in vars(module).values():
+            if isinstance(value, types.ModuleType):
+                dependency = value.__name__
+            else:
+                dependency = getattr(value, "__module__", None)
+            if isinstance(dependency, str) and dependency.startswith(PACKAGES) and dependency not in result:
+                pending.append(dependency)
+    return result
+
+
+class ExtensionReloader:
+    """Перезагрузка только изменившихся расширений.
+
+    После загрузки расширения запоминаются mtime и хэш его файлов и всех
+    модулей бота, от которых оно зависит. reload_changed() перезагружает
+    только расширения, у которых изменилось содержимое хотя бы одного файла;
+    состояние старого cog (export_state) передаётся новому через hand_over/take_over.
+    """
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self._files: Dict[str, Dict[str, Tuple[float, str]]] = {}
+        self.pinned: Set[str] = set()
+
+    def pin_main(self) -> None:
+        """Модули, импортированные главным файлом бота, нельзя перезагрузить без перезапуска"""
+        self.pinned = {name for name in dependencies("__main__") if name != "__main__"}
+
+    def track(self, extension: str) -> None:
+        modules = dependencies(extension)
+        # Пакет расширения целиком (например, конфиг, подключённый через import *)
+        package = extension.split(".")[1]
+        modules |= {name for name in sys.modules if name.startswith((f"Modules.{package}.", f"Config.{package}."))}
+        files = {}
+        for name in modules:
+            path = getattr(sys.modules.get(name), "__file__", None)
+            if path and os.path.exists(path):
+                files[name] = (os.path.getmtime(path), file_hash(path))
+        self._files[extension] = files
+
+    def forget(self, extension: str) -> None:
+        self._files.pop(extension, None)
+
+    def changed(self) -> Dict[str, Set[str]]:
+        """Расширения и изменившиеся модули, от которых они зависят"""
+        result = {}
+        hashes = {}
+        for extension, files in self._files.items():
+            modules = set()
+            for name, (mtime, digest) in files.items():
+                path = getattr(sys.modules.get(name), "__file__", None)
+                if not path or not os.path.exists(path):
+                    continue
+                # Хэш считается только при изменившемся mtime; сохранение без правок не считается
+                if os.path.getmtime(path) != mtime:
+                    if path not in hashes:
+                        hashes[path] = file_hash(path)
+                    if hashes[path] != digest:
+                        modules.add(name)
+            if modules:
+                result[extension] = modules
+        return result
+
+    async def reload_changed(self) -> Tuple[List[str], List[Tuple[str, str]], Set[str]]:
+        """(перезагруженные, [(ошибка загрузки)], изменённые модули, требующие перезапуска)"""
+        changed = self.changed()
+        reloaded = []
+        failed = []
+        restart = set()
+
+        for extension, modules in changed.items():
+            restart |= (modules - {extension}) & self.pinned
+            # Перезагружаются изменённые модули и модули, которые их импортируют
+            helpers = {
+                name for name in self._files[extension]
+                if name != extension and name not in self.pinned and dependencies(name) & modules
+            }
+
+            # Состояние отдаётся новому экземпляру cog вместо пересоздания
+            handed = []
+            for cog in list(self.bot.cogs.values()):
+                if type(cog).__module__ == extension and hasattr(cog, "export_state"):
+                    hand_over(self.bot, cog.qualified_name, cog.export_state())
+                    handed.append(cog.qualified_name)
+
+            # Изменённые вспомогательные модули удаляются из кэша импорта,
+            # иначе новое расширение получит их старые версии
+            removed = {name: sys.modules.pop(name) for name in helpers if name in sys.modules}
+            try:
+                await self.bot.reload_extension(extension)
+                reloaded.append(extension)
+                # Файлы считаются загруженными только после успешной перезагрузки:
+                # сломанный модуль останется изменённым и будет перезагружен снова
+                self.track(extension)
+            except Exception as e:
+                # discord.py возвращает старую версию расширения, вместе с ней - старые модули
+                sys.modules.update(removed)
+                failed.append((extension, str(e)))
+                log.error(f"Не удалось перезагрузить {extension}: {e}", extra={"extension": extension})
+            finally:
+                # Состояние, которое новый cog не забрал, закрывается, чтобы не оставить соединений
+                for name in handed:
+                    await discard_state(take_over(self.bot, name))
+        return reloaded, failed, restart
+
+
+def hand_over(bot: commands.Bot, name: str, state: dict) -> None:
+    bot.__dict__.setdefault("_handover", {})[name] = state
+
+
+def take_over(bot: commands.Bot, name: str) -> Optional[dict]:
+    """Состояние, переданное предыдущим экземпляром cog (один раз)"""
+    return bot.__dict__.get("_handover", {}).pop(name, None)
+
+
+async def discard_state(state: Optional[dict]) -> None:
+    for value in (state or {}).values():
+        close = getattr(value, "close", None)
+        if close is not None and inspect.iscoroutinefunction(close):
+            try:
+                await close()
+            except Exception as e:
+                log.error(f"Ошибка закрытия {type(value).__name__}: {e}")
@@ -1,9 +1,23 @@
-import requests, json
+import asyncio, json, os, sys
 
-with open('webhook.json') as json_file:
-    data = json.load(json_file)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from Modules.Tools.http_client import HTTPClient
 
 url = 'https://discord.com/api/webhooks/1327708083836686456/zv2mXeZ76aVruKIgSYKOh7x6_6IgBKYSwkfWKXwFKLe_bQw57JoSzzKaUbbR6ES7UQap'
-headers={"Content-Type": "application/json"}
 
-requests.post(url, data=json.dumps(data), headers=headers)
\ No newline at end of file
+
+async def main():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'webhook.json')) as json_file:
+        data = json.load(json_file)
+
+    http = HTTPClient()
+    await http.start()
+    try:
+        response = await http.post_json(url, data)
+        print(response.status)
+    finally:
+        await http.close()
+
+
+asyncio.run(main())
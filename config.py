@@ -7,7 +7,69 @@ SETTINGS = {
     "command_role": 1061998983158964285,
     "hasntRole_embed_color": 0xff1100,
     "GUILD": os.getenv('Guild'),
-    "TOKEN": os.getenv('BOT_TOKEN')
+    "TOKEN": os.getenv('BOT_TOKEN'),
+    # Локальный эндпоинт метрик в формате Prometheus (не задан порт - выключен)
+    "metrics_host": os.getenv('METRICS_HOST', "127.0.0.1"),
+    "metrics_port": os.getenv('METRICS_PORT'),
+    # Хэш последнего синхронизированного дерева команд: без изменений синхронизация пропускается
+    "tree_hash_path": "Saves/command_tree.sha1"
+}
+# Общий HTTP-клиент бота
+HTTP = {
+    "timeout": 30.0,  # Общее время запроса, с
+    "connect_timeout": 10.0,
+    "limit": 100,  # Соединений в пуле всего
+    "limit_per_host": 10,
+    "dns_ttl": 300,  # Время кэширования DNS, с
+    "max_body": 10 * 1024 * 1024  # Максимальный размер ответа, байт
+}
+# Каталог emoji.gg
+EMOJI = {
+    "catalog_path": "Saves/Tools/emoji_gg.json",
+    "catalog_ttl": 6 * 3600,  # Как часто проверять обновление каталога, с
+    "import_concurrency": 4,  # Одновременных скачиваний при массовом импорте
+    "upload_interval": 2.0  # Пауза между загрузками эмодзи в Discord, с
+}
+# Язык сообщений: по умолчанию из переменной Lang, для сервера его можно сменить командой /language
+LOCALIZATION = {
+    "default": language or "ru",
+    "fallback": "ru",  # Язык, из которого берутся строки, отсутствующие в выбранном каталоге
+    "guild_locales_path": "Saves/locales.json"
+}
+# Подключение к гейтвею Discord
+GATEWAY = {
+    # Экономный режим: только нужные модулям события (INTENTS в Modules/<модуль>/main.py),
+    # без кэша участников и загрузки их списков при старте
+    "lean": os.getenv('GATEWAY_LEAN', "1") != "0",
+    # События, которые нужны самому main.py: команды с префиксом и эмодзи
+    "intents": ("guilds", "guild_messages", "message_content", "emojis_and_stickers"),
+    "max_messages": 100,  # Размер кэша сообщений (0 - без кэша)
+    "memory_interval": 300  # Как часто писать в лог память процесса и размеры кэшей, с (0 - не писать)
+}
+# Шарды: несколько процессов бота делят серверы Discord между собой
+SHARDING = {
+    # Шарды этого процесса через запятую (не задано - все шарды в одном процессе)
+    "shard_ids": [int(shard) for shard in os.getenv('SHARD_IDS', "").split(",") if shard.strip()] or None,
+    # Всего шардов во всех процессах (не задано - рекомендованное Discord число)
+    "shard_count": int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None,
+    # Общая для процессов база аренды лидера: лидер выполняет общие задачи (статус бота и т.п.)
+    "lease_path": os.getenv('LEASE_PATH', "Saves/leader.db"),
+    "lease_ttl": 30.0  # Через сколько секунд без продления роль лидера переходит другому процессу
+}
+LOGGING = {
+    "path": os.getenv('LOG_PATH', "Saves/logs/bot.jsonl"),
+    "level": os.getenv('LOG_LEVEL', "INFO"),
+    "console_level": os.getenv('LOG_CONSOLE_LEVEL', "INFO"),
+    "max_bytes": 10 * 1024 * 1024,  # Размер файла до ротации
+    "backups": 5,  # Сколько старых файлов хранить
+    # Отладочный вывод discord.py (гейтвей, HTTP) слишком подробный для постоянной записи
+    "modules": {
+        "discord": "INFO",
+        "discord.gateway": "WARNING",
+        "discord.http": "WARNING",
+        "aiosqlite": "WARNING",
+        "aiohttp.access": "WARNING",
+    }
 }
 LANG = {
     "name": "Discord SukaBot 3000",
@@ -1,31 +1,148 @@
 import discord
 from discord.ext import commands
 import os
+import re
 import config
 from Modules.Tools.main import *
+from Modules.Tools.metrics import metrics
+from Modules.Tools.logs import setup_logging
+from Modules.Tools.http_client import HTTPClient, ResponseTooLarge
+from Modules.Tools.emoji_catalog import EmojiCatalog
+from Modules.Tools.reloader import ExtensionReloader
+from Modules.Tools.emoji_import import EmojiImporter, format_summary, parse_sources, read_archive, shrink_image
+from Modules.Tools.i18n import i18n
+from Modules.Tools.gateway import client_options
+from Modules.Tools.lease import Lease
+from discord import app_commands
 import aiohttp
-from io import BytesIO
+import asyncio
+import hashlib
+import json
+import socket
 import config
 import logging
 
 
-# Создание экземпляра бота
-bot = commands.Bot(command_prefix="/", intents=discord.Intents.all())
+class Bot(commands.AutoShardedBot):
+    """Бот с общим HTTP-клиентом, который живёт столько же, сколько бот.
+
+    Шарды можно разделить между несколькими процессами (SHARD_IDS / SHARD_COUNT);
+    общие для всех процессов задачи выполняет тот, у кого аренда лидера (self.lease).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        metrics.collectors.append(self.cache_sizes)
+        self.http_client = HTTPClient(**config.HTTP)
+        self.lease = Lease(config.SHARDING["lease_path"], ttl=config.SHARDING["lease_ttl"],
+                           owner=f"{socket.gethostname()}:{os.getpid()}:{self.shard_ids or 'all'}")
+        self.reloader = ExtensionReloader(self)
+        self.emoji_catalog = EmojiCatalog(self.http_client, config.EMOJI["catalog_path"], ttl=config.EMOJI["catalog_ttl"])
+        self.emoji_importer = EmojiImporter(
+            self.http_client,
+            concurrency=config.EMOJI["import_concurrency"],
+            upload_interval=config.EMOJI["upload_interval"]
+        )
+
+    async def setup_hook(self):
+        """Запуск один раз до подключения к гейтвею (on_ready срабатывает и после переподключений)."""
+        await self.http_client.start()
+        await self.lease.open()
+        metrics.start()
+        if config.SETTINGS["metrics_port"]:
+            try:
+                await metrics.serve(config.SETTINGS["metrics_host"], int(config.SETTINGS["metrics_port"]))
+            except Exception as e:
+                logging.error(f"Не удалось запустить эндпоинт метрик: {e}")
+
+        self.reloader.pin_main()
+        await asyncio.gather(self.emoji_catalog.load(), load_cogs())
+        # Дерево команд одно на приложение: его синхронизирует только лидер
+        if self.lease.is_leader:
+            await sync_tree()
 
-logging.basicConfig(level=logging.DEBUG, filename="logs.xml", filemode="w")
+    async def close(self):
+        await super().close()
+        await self.lease.close()
+        await self.http_client.close()
+
+    def cache_sizes(self):
+        """Размеры кэшей discord.py для метрик"""
+        yield "cached_guilds", "", len(self.guilds)
+        yield "cached_users", "", len(self.users)
+        yield "cached_members", "", sum(len(guild.members) for guild in self.guilds)
+        yield "cached_messages", "", len(self.cached_messages)
+
+
+def cog_folders():
+    """Папки модулей с main.py - расширения бота"""
+    return [folder for folder in sorted(os.listdir("./Modules")) if os.path.exists(f"./Modules/{folder}/main.py")]
+
+
+# Логи настраиваются до создания бота: выбор intents уже пишет в лог
+setup_logging(
+    config.LOGGING["path"],
+    level=config.LOGGING["level"],
+    module_levels=config.LOGGING["modules"],
+    max_bytes=config.LOGGING["max_bytes"],
+    backups=config.LOGGING["backups"],
+    console_level=config.LOGGING["console_level"]
+)
+
+# Создание экземпляра бота
+metrics.memory_interval = config.GATEWAY["memory_interval"]
+bot = Bot(
+    command_prefix="/",
+    http_trace=metrics.http_trace(),
+    shard_ids=config.SHARDING["shard_ids"],
+    shard_count=config.SHARDING["shard_count"],
+    **client_options(config.GATEWAY["lean"], config.GATEWAY["intents"], cog_folders(), config.GATEWAY["max_messages"])
+)
 
 @bot.event
 async def on_ready():
     """Событие запуска бота."""
     print(f"Бот {bot.user} запущен!")
     logging.debug(f"Bot {bot.user} is running!")
-    
-    await load_cogs()
+    metrics.collect()
+    logging.info(
+        f"Бот {bot.user} запущен, память: {metrics.gauges[('memory_rss_bytes', '')] / 2 ** 20:.0f} МБ",
+        extra={
+            "intents": bot.intents.value, "shard_ids": bot.shard_ids, "shard_count": bot.shard_count,
+            "leader": bot.lease.is_leader, **{name: value for (name, label), value in metrics.gauges.items() if not label}
+        }
+    )
+
+
+def tree_hash() -> str:
+    """Хэш дерева команд в том виде, в котором оно отправляется в Discord"""
+    commands_data = sorted(
+        (command.to_dict(bot.tree) for command in bot.tree.get_commands()),
+        key=lambda data: (data.get("type", 1), data["name"])
+    )
+    payload = json.dumps([bot.application_id, commands_data], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+async def sync_tree(force: bool = False):
+    """Синхронизация команд, только если дерево изменилось с прошлой синхронизации."""
+    path = config.SETTINGS["tree_hash_path"]
+    current = tree_hash()
+    if not force and os.path.exists(path):
+        with open(path) as f:
+            if f.read().strip() == current:
+                logging.info("Дерево команд не изменилось, синхронизация пропущена")
+                return
     try:
         synced = await bot.tree.sync()
         print(f"Синхронизировано {len(synced)} команд: {synced}")
     except Exception as e:
         print(f"Ошибка синхронизации команд: {e}")
+        logging.error(f"Ошибка синхронизации команд: {e}")
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(current)
 
 
 async def load_cogs():
@@ -33,27 +150,26 @@ async def load_cogs():
     print("Загружаем модули...")
     logging.debug("Loading modules...")
 
-    loaded_cogs = []
-    failed_cogs = []
-
-    for folder in os.listdir("./Modules"):
-        cog_path = f"Modules.{folder}.main"
-        if os.path.exists(f"./Modules/{folder}/main.py"):
-            try:
-                await bot.load_extension(cog_path)
-                loaded_cogs.append(folder)
-            except Exception as e:
-                failed_cogs.append((folder, str(e)))
+    folders = cog_folders()
+    # Модули независимы друг от друга, их cog_load (базы, сеть) выполняются одновременно
+    results = await asyncio.gather(
+        *(bot.load_extension(f"Modules.{folder}.main") for folder in folders),
+        return_exceptions=True
+    )
+    loaded_cogs = [folder for folder, result in zip(folders, results) if not isinstance(result, BaseException)]
+    for folder in loaded_cogs:
+        bot.reloader.track(f"Modules.{folder}.main")
+    failed_cogs = [(folder, str(result)) for folder, result in zip(folders, results) if isinstance(result, BaseException)]
 
     print(f"Загруженные модули: {', '.join(loaded_cogs) if loaded_cogs else 'Нет'}")
-    logging.info(f"Загруженные модули: {', '.join(loaded_cogs) if loaded_cogs else 'Нет'}")
+    logging.info(f"Загруженные модули: {', '.join(loaded_cogs) if loaded_cogs else 'Нет'}", extra={"modules": loaded_cogs})
 
     if failed_cogs:
         print("Не удалось загрузить следующие модули:")
         logging.critical("Не удалось загрузить следующие модули:")
         for cog, error in failed_cogs:
             print(f"- {cog}: {error}")
-            logging.critical(f"- {cog}: {error}")
+            logging.critical(f"- {cog}: {error}", extra={"cog": cog})
 
 
 async def unload_cogs():
@@ -69,6 +185,7 @@ async def unload_cogs():
         if os.path.exists(f"./Modules/{folder}/main.py"):
             try:
                 await bot.unload_extension(cog_path)
+                bot.reloader.forget(cog_path)
                 unloaded_cogs.append(folder)
             except Exception as e:
                 failed_cogs.append((folder, str(e)))
@@ -80,17 +197,39 @@ async def unload_cogs():
         logging.critical("Модули с ошибкой:")
         for cog, error in failed_cogs:
             print(f"- {cog}: {error}")
-            logging.critical(f"- {cog}: {error}")
+            logging.critical(f"- {cog}: {error}", extra={"cog": cog})
 
 
-@bot.command(name="reload", description="Перезагружает все модули бота")
+@bot.command(name="reload", description="Перезагружает изменённые модули бота (reload all - все модули)")
 @commands.has_role(config.SETTINGS["command_role"])
-async def reload(interaction: discord.Interaction):
-    """Команда для перезагрузки всех модулей."""
-    await interaction.response.send_message("Перезагрузка модулей...")
-    await unload_cogs()
-    await load_cogs()
-    await interaction.followup.send("Модули перезагружены!")
+async def reload(ctx: commands.Context, mode: str = "changed"):
+    """Команда для перезагрузки модулей."""
+    if mode == "all":
+        await Tools.respond(ctx, "Перезагрузка модулей...")
+        await unload_cogs()
+        await load_cogs()
+        await sync_tree()
+        return await Tools.respond(ctx, "Модули перезагружены!")
+
+    reloaded, failed, restart = await bot.reloader.reload_changed()
+    await sync_tree()
+    embed = discord.Embed(title="Перезагрузка изменённых модулей")
+    embed.add_field(name="Перезагружены", value="\n".join(reloaded) or "Изменений нет", inline=False)
+    if failed:
+        embed.add_field(name="Ошибки", value="\n".join(f"{name}: {error}" for name, error in failed)[:1024], inline=False)
+    if restart:
+        embed.add_field(name="Нужен перезапуск бота", value="\n".join(sorted(restart))[:1024], inline=False)
+    await Tools.respond(ctx, embed=embed)
+
+
+@bot.command(name="metrics", description="Показывает задержку event loop, время операций и запросы к Discord")
+@commands.has_role(config.SETTINGS["command_role"])
+async def metrics_command(ctx: commands.Context):
+    """Команда для просмотра метрик бота."""
+    embed = discord.Embed(title="Метрики", description=f"Макс. задержка event loop: {metrics.lag_max * 1000:.0f} мс")
+    for name, value in metrics.summary()[:25]:
+        embed.add_field(name=name, value=value[:1024], inline=False)
+    await Tools.respond(ctx, embed=embed)
 
 
 @bot.command(aliases=['dev'], description="Dev Info")
@@ -128,47 +267,55 @@ async def on_command_error(ctx: commands.Context, error: commands.CommandError):
         logging.error(error)
 
 
-@bot.command(name="add_emojigg", description="Добавляет эмодзи с emoji.gg")
-async def add_emojigg(interaction: discord.Interaction, arg: str):
+async def emojigg_autocomplete(interaction: discord.Interaction, current: str):
+    # Автодополнение работает только по уже загруженному каталогу, без сети
+    return [
+        app_commands.Choice(name=f"{emoji['slug']} ({emoji['id']})"[:100], value=str(emoji["id"]))
+        for emoji in bot.emoji_catalog.search(current)
+    ]
+
+
+@bot.tree.command(name="add_emojigg", description="Добавляет эмодзи с emoji.gg")
+@app_commands.describe(emoji="ID, ID-название или название эмодзи на emoji.gg")
+@app_commands.autocomplete(emoji=emojigg_autocomplete)
+async def add_emojigg(interaction: discord.Interaction, emoji: str):
+    if not interaction.user.guild_permissions.manage_emojis:
+        return await interaction.response.send_message("❌ У вас нет прав на управление эмодзи!", ephemeral=True)
+
+    # Загрузка каталога и картинки может занять больше 3 секунд
+    await interaction.response.defer()
     try:
-        # Разбираем аргументы команды
-        parts = arg.split()
-        if len(parts) != 2 or not parts[0].startswith("type:") or not parts[1].startswith("id:"):
-            return await interaction.response.send_message("Используйте формат: /add_emojigg type:emoji id:XXXX-name")
+        try:
+            await bot.emoji_catalog.ensure_fresh()
+        except aiohttp.ClientError:
+            return await interaction.followup.send("Не удалось получить список эмодзи.")
+        
+        # Ищем эмодзи по ID или названию
+        emoji_data = bot.emoji_catalog.get(emoji)
+        if not emoji_data:
+            return await interaction.followup.send("Эмодзи с таким ID не найдено.")
+        
+        emoji_url = emoji_data['image']
+        # В названии эмодзи Discord допускает только буквы, цифры и _
+        emoji_name = re.sub(r"[^A-Za-z0-9_]", "_", emoji_data['slug'])[:32]
+        
+        # Загружаем эмодзи на сервер
+        try:
+            img_data = await bot.http_client.get_bytes(emoji_url)
+        except aiohttp.ClientError:
+            return await interaction.followup.send("Ошибка загрузки изображения эмодзи.")
+        # Картинки больше 256 КБ Discord не принимает, они уменьшаются
+        img_data, _ = await asyncio.get_running_loop().run_in_executor(None, shrink_image, img_data)
         
-        emoji_id = parts[1][3:].split('-')[0]  # Получаем ID эмодзи
+        guild = interaction.guild
+        created = await guild.create_custom_emoji(name=emoji_name, image=img_data)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get("https://emoji.gg/api/") as response:
-                if response.status != 200:
-                    return await interaction.response.send_message("Не удалось получить список эмодзи.")
-                
-                data = await response.json()
-                
-                # Ищем эмодзи по ID
-                emoji_data = next((e for e in data if str(e['id']) == emoji_id), None)
-                if not emoji_data:
-                    return await interaction.response.send_message("Эмодзи с таким ID не найдено.")
-                
-                emoji_url = emoji_data['image']
-                emoji_name = emoji_data['slug']
-                
-                # Загружаем эмодзи на сервер
-                async with session.get(emoji_url) as img_response:
-                    if img_response.status != 200:
-                        return await interaction.response.send_message("Ошибка загрузки изображения эмодзи.")
-                    img_data = BytesIO(await img_response.read()).getvalue()
-                    
-                    guild = interaction.guild
-                    is_animated = emoji_url.endswith(".gif")
-                    emoji = await guild.create_custom_emoji(name=emoji_name, image=img_data, animated=is_animated)
-                    
-                    await interaction.response.send_message(f'✅ Эмодзи {emoji.name} добавлено! {emoji}')
+        await interaction.followup.send(f'✅ Эмодзи {created.name} добавлено! {created}')
     
-    except discord.HTTPException:
-        await interaction.response.send_message("❌ Ошибка: файл слишком большой!")
+    except (discord.HTTPException, ResponseTooLarge):
+        await interaction.followup.send("❌ Ошибка: файл слишком большой!")
     except Exception as e:
-        await interaction.response.send_message(f'❌ Ошибка: {e}')
+        await interaction.followup.send(f'❌ Ошибка: {e}')
 
 
 @bot.command(name="add_emoji", description="Добавляет эмодзи по ссылке")
@@ -177,24 +324,75 @@ async def add_emoji(interaction: discord.Interaction, url: str, name: str):
         return await interaction.response.send_message("❌ У вас нет прав на управление эмодзи!", ephemeral=True)
     
     try:
-        async with aiohttp.ClientSession() as ses:
-            async with ses.get(url) as r:
-                if r.status not in range(200, 299):
-                    return await interaction.response.send_message(f'Ошибка при запросе | Код ответа: {r.status}.')
-                
-                try:
-                    img_or_gif = BytesIO(await r.read())
-                    b_value = img_or_gif.getvalue()
-                    emoji = await interaction.guild.create_custom_emoji(image=b_value, name=name)
-                    await interaction.response.send_message(f'Успешно создано эмодзи: <:{name}:{emoji.id}>')
-                except discord.HTTPException:
-                    await interaction.response.send_message('❌ Размер файла слишком большой!')
-                except Exception as e:
-                    await interaction.response.send_message(f'❌ Ошибка: {e}')
+        async with bot.http_client.session.get(url) as r:
+            if r.status not in range(200, 299):
+                return await interaction.response.send_message(f'Ошибка при запросе | Код ответа: {r.status}.')
+            
+            try:
+                b_value = await bot.http_client.read_limited(r)
+                b_value, _ = await asyncio.get_running_loop().run_in_executor(None, shrink_image, b_value)
+                emoji = await interaction.guild.create_custom_emoji(image=b_value, name=name)
+                await interaction.response.send_message(f'Успешно создано эмодзи: <:{name}:{emoji.id}>')
+            except (discord.HTTPException, ResponseTooLarge):
+                await interaction.response.send_message('❌ Размер файла слишком большой!')
+            except Exception as e:
+                await interaction.response.send_message(f'❌ Ошибка: {e}')
     except Exception as e:
         await interaction.response.send_message(f'❌ Ошибка: {e}')
 
 
+@bot.tree.command(name="import_emojis", description="Добавляет много эмодзи: ссылки, ID emoji.gg или zip-архив")
+@app_commands.describe(
+    sources="Ссылки на картинки и ID/названия emoji.gg через пробел или запятую",
+    archive="Zip-архив с картинками (название эмодзи - имя файла)"
+)
+async def import_emojis(interaction: discord.Interaction, sources: str = None, archive: discord.Attachment = None):
+    if not interaction.user.guild_permissions.manage_emojis:
+        return await interaction.response.send_message("❌ У вас нет прав на управление эмодзи!", ephemeral=True)
+    if not sources and archive is None:
+        return await interaction.response.send_message("Укажите ссылки, ID emoji.gg или приложите zip-архив.", ephemeral=True)
+
+    await interaction.response.defer()
+    try:
+        items, errors = [], []
+        if sources:
+            if not all(item.startswith(("http://", "https://")) for item in sources.replace(",", " ").split()):
+                await bot.emoji_catalog.ensure_fresh()
+            items, errors = parse_sources(sources, bot.emoji_catalog)
+        if archive is not None:
+            data = await archive.read()
+            items += await asyncio.get_running_loop().run_in_executor(None, read_archive, data)
+        if not items and not errors:
+            return await interaction.followup.send("Не найдено ни одной картинки.")
+
+        results = await bot.emoji_importer.run(interaction.guild, items, reason=f"import_emojis: {interaction.user}")
+        await interaction.followup.send(format_summary(errors + results))
+    except Exception as e:
+        await interaction.followup.send(f'❌ Ошибка: {e}')
+
+
+async def language_autocomplete(interaction: discord.Interaction, current: str):
+    locales = ["auto"] + i18n.locales("Minecraft")
+    return [app_commands.Choice(name=locale, value=locale) for locale in locales if locale.startswith(current.lower())]
+
+
+@bot.tree.command(name="language", description="Язык сообщений бота на этом сервере")
+@app_commands.describe(locale="Код языка (auto - по языку сервера Discord и пользователя)")
+@app_commands.autocomplete(locale=language_autocomplete)
+async def language(interaction: discord.Interaction, locale: str):
+    if not interaction.user.guild_permissions.manage_guild:
+        return await interaction.response.send_message("❌ У вас нет прав на управление сервером!", ephemeral=True)
+    locale = locale.strip().lower()
+    if locale != "auto" and locale not in i18n.locales("Minecraft"):
+        return await interaction.response.send_message(
+            f"Нет перевода для `{locale}`. Доступно: {', '.join(i18n.locales('Minecraft'))}", ephemeral=True
+        )
+
+    i18n.set_guild_locale(interaction.guild_id, None if locale == "auto" else locale)
+    # Сообщения серверов перерисуются на новом языке при следующем опросе
+    await interaction.response.send_message(f"✅ Язык бота: {i18n.guild_locale(interaction.guild)}", ephemeral=True)
+
+
 @bot.command(name="delete_emoji", description="Удаляет эмодзи")
 async def delete_emoji(interaction: discord.Interaction, emoji: discord.Emoji):
     if not interaction.user.guild_permissions.manage_emojis:
@@ -209,7 +407,8 @@ async def delete_emoji(interaction: discord.Interaction, emoji: discord.Emoji):
 
 if __name__ == "__main__":
     try:
-        bot.run(config.SETTINGS["TOKEN"])
+        # Логирование уже настроено, свой обработчик discord.py не нужен
+        bot.run(config.SETTINGS["TOKEN"], log_handler=None)
     except Exception as e:
         print(f"Не удалось запустить бота: {e}")
         logging.critical(f"Не удалось запустить бота: {e}")